@@ -0,0 +1,360 @@
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import random
+import re
+import resource
+import subprocess
+import sys
+import time
+
+import network_debugger
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+DEFAULT_SCALES = [100, 1000, 10000, 100000]
+DEFAULT_RATE = 5000  # Synthetic captures per second
+DEFAULT_BODY_BYTES = 2000
+DEFAULT_DISTINCT_BODIES = 50  # Response bodies repeat, like config queries and unchanged listings
+RENDER_SAMPLE = 1000  # Entries rendered to time the formatter
+DEFAULT_OUTPUT = "bench_network_debugger.json"
+
+# ============================================================================
+# COMMAND LINE ARGUMENT PARSER
+# ============================================================================
+
+def create_parser():
+    """Create and return the argument parser."""
+    parser = argparse.ArgumentParser(description='Benchmark the network_debugger poll loop at synthetic volumes')
+
+    parser.add_argument('--scales',
+                        type=int,
+                        nargs='+',
+                        default=DEFAULT_SCALES,
+                        help='Capture counts to run (default: 100 1000 10000 100000)')
+
+    parser.add_argument('--rate', type=int, default=DEFAULT_RATE, help=f'Captures per second (default: {DEFAULT_RATE})')
+
+    parser.add_argument('--body-bytes',
+                        type=int,
+                        default=DEFAULT_BODY_BYTES,
+                        help=f'Response body size (default: {DEFAULT_BODY_BYTES})')
+
+    parser.add_argument('--distinct-bodies',
+                        type=int,
+                        default=DEFAULT_DISTINCT_BODIES,
+                        help=f'Different response bodies to cycle through (default: {DEFAULT_DISTINCT_BODIES})')
+
+    parser.add_argument('--check-interval', type=float, default=0.05, help='Poll interval in seconds (default: 0.05)')
+
+    parser.add_argument('--preset',
+                        choices=list(network_debugger.PRESETS.keys()),
+                        default='all',
+                        help='network_debugger preset used for rendering (default: all)')
+
+    parser.add_argument('--browser',
+                        action='store_true',
+                        help='Run against headless Firefox instead of the stub driver')
+
+    parser.add_argument('--out', '-o', default=DEFAULT_OUTPUT, help=f'Results file (default: {DEFAULT_OUTPUT})')
+
+    parser.add_argument('--compare', metavar='FILE', help='Print the change against an earlier results file')
+
+    return parser
+
+# ============================================================================
+# SYNTHETIC TRAFFIC
+# ============================================================================
+
+def make_bodies(count, size, seed=0):
+    """Distinct JSON response bodies of roughly size bytes each."""
+    rng = random.Random(seed)
+    bodies = []
+    for i in range(count):
+        filler = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz ") for _ in range(max(0, size - 60)))
+        bodies.append({"data": {"id": f"body{i}", "text": filler}})
+    return bodies
+
+def make_entry(number, bodies):
+    """One request/response pair shaped like the page monitor's output."""
+    return {
+        "request": {
+            "url": "https://www.reddit.com/svc/shreddit/graphql",
+            "method": "POST",
+            "timestamp": "2026-01-01T12:00:00.000Z",
+            "headers": {"content-type": "application/json", "x-request-number": str(number)},
+            "body": {"operation": "SubredditFeed", "variables": {"after": f"t3_{number:x}", "first": 25}},
+        },
+        "response": {
+            "status": 200 if number % 50 else 500,
+            "statusText": "OK",
+            "duration": 20 + number % 400,
+            "headers": {"content-type": "application/json"},
+            "body": bodies[number % len(bodies)],
+        },
+    }
+
+class StubDriver:
+    """
+    Stands in for Firefox. The poll script returns whatever arrived since the
+    last poll at the configured rate, round-tripped through JSON the way
+    WebDriver marshals execute_script results.
+    """
+
+    def __init__(self, rate, bodies):
+        self.rate = rate
+        self.bodies = bodies
+        self.current_url = "about:blank"
+        self.generated = 0
+        self.limit = 0
+        self.last_poll = time.perf_counter()
+
+    def start(self, limit):
+        self.generated = 0
+        self.limit = limit
+        self.last_poll = time.perf_counter()
+
+    def execute_script(self, script, *args):
+        if "splice" not in script:
+            # Monitor installation: the script text is serialised and sent once
+            json.dumps({"script": script, "args": args})
+            return None
+
+        now = time.perf_counter()
+        due = min(self.limit - self.generated, int((now - self.last_poll) * self.rate))
+        if due <= 0:
+            return []
+        self.last_poll = now
+        entries = [make_entry(self.generated + i, self.bodies) for i in range(due)]
+        self.generated += due
+        return json.loads(json.dumps(entries))
+
+    def quit(self):
+        pass
+
+BROWSER_GENERATOR_SCRIPT = """
+    const [limit, rate, bodies] = arguments;
+    let generated = 0;
+    clearInterval(window.__benchTimer);
+    window.__benchTimer = setInterval(() => {
+        const due = Math.min(limit - generated, Math.ceil(rate / 100));
+        for (let i = 0; i < due; i++, generated++) {
+            window.capturedRequests.push({
+                request: {url: 'https://www.reddit.com/svc/shreddit/graphql', method: 'POST',
+                          timestamp: new Date().toISOString(),
+                          headers: {'content-type': 'application/json', 'x-request-number': String(generated)},
+                          body: {operation: 'SubredditFeed', variables: {after: 't3_' + generated.toString(16), first: 25}}},
+                response: {status: generated % 50 ? 200 : 500, statusText: 'OK', duration: 20 + generated % 400,
+                           headers: {'content-type': 'application/json'}, body: bodies[generated % bodies.length]}
+            });
+        }
+        if (generated >= limit) clearInterval(window.__benchTimer);
+    }, 10);
+"""
+
+class BenchDriver:
+    """
+    Wraps the real or stub driver: times each poll, counts entries and bytes,
+    samples RSS, and ends the run (as if the browser closed) once the target
+    number of captures has been drained.
+    """
+
+    def __init__(self, driver, target):
+        self.driver = driver
+        self.target = target
+        self.captures = 0
+        self.bytes = 0
+        self.poll_ms = []
+        self.rss_peak = rss_bytes()
+
+    @property
+    def current_url(self):
+        return self.driver.current_url
+
+    def execute_script(self, script, *args):
+        if "splice" not in script:
+            return self.driver.execute_script(script, *args)
+
+        from selenium.common.exceptions import WebDriverException
+
+        if self.captures >= self.target:
+            raise WebDriverException("benchmark target reached")
+
+        started = time.perf_counter()
+        entries = self.driver.execute_script(script, *args) or []
+        self.poll_ms.append((time.perf_counter() - started) * 1000)
+        self.captures += len(entries)
+        self.bytes += len(json.dumps(entries))
+        self.rss_peak = max(self.rss_peak, rss_bytes())
+        return entries
+
+# ============================================================================
+# MEASUREMENT
+# ============================================================================
+
+def rss_bytes():
+    """Current resident set size of this process."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        # No procfs: peak RSS is the best available (KiB on Linux, bytes on macOS)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+class OutputSink:
+    """Counts what the output writer prints and keeps the summary lines."""
+
+    def __init__(self):
+        self.bytes = 0
+        self.tail = []
+
+    def write(self, text):
+        self.bytes += len(text)
+        self.tail = (self.tail + text.splitlines())[-20:]
+        return len(text)
+
+    def flush(self):
+        pass
+
+def time_render(config, bodies):
+    """Average milliseconds format_request needs per entry."""
+    entries = [make_entry(i, bodies) for i in range(RENDER_SAMPLE)]
+    started = time.perf_counter()
+    for number, entry in enumerate(entries, 1):
+        network_debugger.format_request(entry, number, config)
+    return (time.perf_counter() - started) * 1000 / RENDER_SAMPLE
+
+def run_scale(driver, target, args, config):
+    """Run stream_network_activity until target captures were drained and return its measurements."""
+    gc.collect()
+    rss_start = rss_bytes()
+
+    if args.browser:
+        driver.execute_script(BROWSER_GENERATOR_SCRIPT, target, args.rate, make_bodies(args.distinct_bodies, args.body_bytes))
+    else:
+        driver.start(target)
+
+    bench = BenchDriver(driver, target)
+    sink = OutputSink()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(sink):
+        network_debugger.stream_network_activity(bench, config)
+    elapsed = time.perf_counter() - started
+
+    degraded = next((int(m.group(1)) for line in sink.tail if (m := re.search(r"(\d+) shown in minimal form", line))), 0)
+    polls = len(bench.poll_ms)
+    return {
+        "captures": bench.captures,
+        "polls": polls,
+        "seconds": round(elapsed, 3),
+        "poll_ms_mean": round(sum(bench.poll_ms) / max(polls, 1), 3),
+        "poll_ms_p95": round(percentile(bench.poll_ms, 95), 3),
+        "loop_ms_per_poll": round(elapsed * 1000 / max(polls, 1), 3),
+        "bytes_transferred": bench.bytes,
+        "bytes_per_capture": round(bench.bytes / max(bench.captures, 1), 1),
+        "output_bytes": sink.bytes,
+        "degraded_output": degraded,
+        "rss_start_mb": round(rss_start / 2**20, 1),
+        "rss_peak_mb": round(bench.rss_peak / 2**20, 1),
+        "rss_growth_mb": round((bench.rss_peak - rss_start) / 2**20, 1),
+    }
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                              capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare_results(old, new):
+    """Print per-scale changes between two results files."""
+    old_by_scale = {r["captures"]: r for r in old["results"]}
+    print(f"\n📐 {old.get('revision')} -> {new.get('revision')}")
+    for result in new["results"]:
+        before = old_by_scale.get(result["captures"])
+        if not before:
+            continue
+        changes = []
+        for key in ("loop_ms_per_poll", "poll_ms_p95", "bytes_per_capture", "rss_growth_mb"):
+            if before[key]:
+                changes.append(f"{key} {(result[key] - before[key]) / before[key]:+.0%}")
+        print(f"  {result['captures']:>7}: {', '.join(changes)}")
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    """Run every scale and write the results as JSON."""
+    args = create_parser().parse_args()
+
+    config = network_debugger.PRESETS[args.preset].copy()
+    config.update(check_interval=args.check_interval, quiet=False, minimal=False,
+                  writer_queue_size=1000, writer_batch_size=50, memory_sample_every=10**9)
+
+    bodies = make_bodies(args.distinct_bodies, args.body_bytes)
+    if args.browser:
+        from selenium import webdriver
+        from selenium.webdriver.firefox.options import Options
+
+        options = Options()
+        options.add_argument("-headless")
+        driver = webdriver.Firefox(options=options)
+        driver.get("about:blank")
+    else:
+        driver = StubDriver(args.rate, bodies)
+
+    install_started = time.perf_counter()
+    network_debugger.install_enhanced_monitor(driver, config)
+    install_ms = (time.perf_counter() - install_started) * 1000
+    render_ms = time_render(config, bodies)
+
+    mode = "browser" if args.browser else "stub"
+    print(f"🏁 {mode} driver, {args.rate}/s, {args.body_bytes}-byte bodies, preset {args.preset}")
+    print(f"   install_enhanced_monitor {install_ms:.1f}ms, render {render_ms:.3f}ms/entry\n")
+    print(f"{'captures':>9} {'polls':>6} {'ms/poll':>8} {'p95 poll':>9} {'B/capture':>10} {'RSS +MB':>8} {'degraded':>9}")
+
+    results = []
+    try:
+        for target in args.scales:
+            result = run_scale(driver, target, args, config)
+            results.append(result)
+            print(f"{result['captures']:>9} {result['polls']:>6} {result['loop_ms_per_poll']:>8.2f} "
+                  f"{result['poll_ms_p95']:>9.2f} {result['bytes_per_capture']:>10.0f} "
+                  f"{result['rss_growth_mb']:>8.1f} {result['degraded_output']:>9}")
+    finally:
+        driver.quit()
+
+    report = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "mode": mode,
+        "params": {"rate": args.rate, "body_bytes": args.body_bytes, "distinct_bodies": args.distinct_bodies,
+                   "check_interval": args.check_interval, "preset": args.preset},
+        "install_ms": round(install_ms, 3),
+        "render_ms_per_entry": round(render_ms, 4),
+        "results": results,
+    }
+    with open(args.out, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Results written to {args.out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare_results(json.load(f), report)
+
+if __name__ == "__main__":
+    main()
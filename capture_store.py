@@ -0,0 +1,204 @@
+import argparse
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from urllib.parse import urlsplit
+
+# ============================================================================
+# SCHEMA
+# ============================================================================
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS captures (
+        id INTEGER PRIMARY KEY,
+        ts REAL NOT NULL,
+        method TEXT,
+        url TEXT,
+        path TEXT,
+        status INTEGER,
+        operation TEXT,
+        duration INTEGER,
+        error TEXT,
+        request TEXT,
+        response TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_captures_ts ON captures (ts);
+    CREATE INDEX IF NOT EXISTS idx_captures_method ON captures (method, ts);
+    CREATE INDEX IF NOT EXISTS idx_captures_status ON captures (status, ts);
+    CREATE INDEX IF NOT EXISTS idx_captures_operation ON captures (operation, status, ts);
+    CREATE INDEX IF NOT EXISTS idx_captures_path ON captures (path, ts);
+"""
+
+DEFAULT_BATCH_SIZE = 200
+
+# ============================================================================
+# WRITING
+# ============================================================================
+
+def parse_timestamp(value):
+    """Convert the monitor's ISO timestamp to unix seconds (now if missing)."""
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+    except (AttributeError, ValueError):
+        return time.time()
+
+def graphql_operation(request):
+    """Return the GraphQL operation name of a captured request, if any."""
+    body = request.get('body')
+    if isinstance(body, dict):
+        return body.get('operation') or body.get('operationName')
+    return None
+
+def capture_row(req_resp):
+    """Flatten a request/response pair into a captures row."""
+    request = req_resp.get('request', {})
+    response = req_resp.get('response', {})
+    url = request.get('url') or ''
+
+    return (
+        parse_timestamp(request.get('timestamp')),
+        request.get('method'),
+        url,
+        urlsplit(url).path,
+        response.get('status'),
+        graphql_operation(request),
+        response.get('duration'),
+        response.get('error'),
+        json.dumps(request),
+        json.dumps(response),
+    )
+
+class CaptureStore:
+    """
+    SQLite sink for captured requests. Runs in WAL mode and inserts in
+    batches, so it can be fed from the poll loop without slowing it down.
+    """
+
+    def __init__(self, path, batch_size=DEFAULT_BATCH_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        self.pending = []
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def add(self, req_resp):
+        """Queue one request/response pair; writes once a batch is full."""
+        self.pending.append(capture_row(req_resp))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write all queued rows in one transaction."""
+        if not self.pending:
+            return
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO captures (ts, method, url, path, status, operation, duration, error, request, response) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", self.pending)
+        self.pending = []
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+# ============================================================================
+# QUERYING
+# ============================================================================
+
+DURATION_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+
+def parse_since(value):
+    """Turn '90s', '30m', '1h', '2d' or '1w' into seconds."""
+    match = re.fullmatch(r'(\d+(?:\.\d+)?)([smhdw])', value.strip())
+    if not match:
+        raise argparse.ArgumentTypeError(f"expected a duration like 30m, 1h or 2d, got {value!r}")
+    return float(match.group(1)) * DURATION_UNITS[match.group(2)]
+
+def parse_status(value):
+    """Check a --status filter: an exact status like '404' or a class like '4xx'."""
+    value = value.strip().lower()
+    if not re.fullmatch(r'[1-5](\d\d|xx)', value):
+        raise argparse.ArgumentTypeError(f"expected a status like 404 or a class like 4xx, got {value!r}")
+    return value
+
+def build_query(method=None, status=None, operation=None, path=None, since=None, limit=100):
+    """Build the SQL and parameters for a filtered capture query, newest first."""
+    clauses = []
+    params = []
+
+    if method:
+        clauses.append("method = ?")
+        params.append(method.upper())
+    if status:
+        # '4xx' matches a status class, '404' an exact status
+        if status.endswith('xx'):
+            low = int(status[0]) * 100
+            clauses.append("status BETWEEN ? AND ?")
+            params += [low, low + 99]
+        else:
+            clauses.append("status = ?")
+            params.append(int(status))
+    if operation:
+        clauses.append("operation = ?")
+        params.append(operation)
+    if path:
+        clauses.append("path LIKE ?")
+        params.append(f"%{path}%")
+    if since:
+        clauses.append("ts >= ?")
+        params.append(time.time() - since)
+
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    sql = f"SELECT id, ts, method, status, operation, duration, url, error, request, response " \
+          f"FROM captures {where} ORDER BY ts DESC LIMIT ?"
+    return sql, params + [limit]
+
+def create_query_parser():
+    """Create the argument parser for the query subcommand."""
+    parser = argparse.ArgumentParser(prog='network_debugger.py query',
+                                     description='Query captures stored with --db')
+    parser.add_argument('--db', required=True, help='SQLite capture database')
+    parser.add_argument('--method', help='HTTP method, e.g. POST')
+    parser.add_argument('--status', type=parse_status, help="Exact status (404) or class (4xx)")
+    parser.add_argument('--operation', help='GraphQL operation name, e.g. CustomFeedAddSubreddits')
+    parser.add_argument('--path', help='Substring of the URL path')
+    parser.add_argument('--since', type=parse_since, help='Only the last 30m / 1h / 2d ...')
+    parser.add_argument('--limit', type=int, default=100, help='Maximum rows (default: 100)')
+    parser.add_argument('--json', action='store_true', help='Print full request/response pairs as JSON lines')
+    return parser
+
+def query_main(argv):
+    """Entry point for `network_debugger.py query ...`."""
+    args = create_query_parser().parse_args(argv)
+    if not os.path.isfile(args.db):
+        print(f"❌ No capture database at {args.db}")
+        sys.exit(1)
+    sql, params = build_query(args.method, args.status, args.operation, args.path, args.since, args.limit)
+
+    try:
+        conn = sqlite3.connect(f"file:{args.db}?mode=ro", uri=True)
+        try:
+            rows = conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        print(f"❌ Cannot read captures from {args.db}: {e}")
+        sys.exit(1)
+
+    for row_id, ts, method, status, operation, duration, url, error, request, response in rows:
+        if args.json:
+            print(json.dumps({'request': json.loads(request), 'response': json.loads(response)}))
+            continue
+        when = datetime.fromtimestamp(ts).strftime('%Y-%m-%d %H:%M:%S')
+        label = f" {operation}" if operation else ""
+        outcome = f"❌ {error}" if error else status
+        print(f"#{row_id} {when} {method} {outcome} ({duration}ms){label} {url}")
+
+    if not args.json:
+        print(f"\n📊 {len(rows)} capture(s)")
@@ -0,0 +1,201 @@
+import contextlib
+import itertools
+import json
+import os
+import queue
+import socket
+import socketserver
+import sys
+import threading
+import time
+import traceback
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+SOCKET_PATH = os.path.join(os.path.expanduser("~"), ".cache", "reddit-custom-feed", "daemon.sock")
+FINAL_EVENTS = {'done', 'error'}
+
+# ============================================================================
+# JOBS
+# ============================================================================
+
+class Job:
+    """One queued request plus the stream of events reported back to its client."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, request):
+        self.id = next(self._ids)
+        self.request = request
+        self.events = queue.Queue()
+        self.submitted = time.time()
+
+    def report(self, event, **fields):
+        self.events.put({'event': event, 'job': self.id, **fields})
+
+class JobProgress:
+    """stdout replacement while a job runs: each printed line becomes a progress event (and still reaches the log)."""
+
+    def __init__(self, job, log):
+        self.job = job
+        self.log = log
+        self.partial = ""
+
+    def write(self, text):
+        self.log.write(text)
+        lines = (self.partial + text).split("\n")
+        self.partial = lines.pop()
+        for line in lines:
+            if line.strip():
+                self.job.report('progress', message=line)
+        return len(text)
+
+    def flush(self):
+        self.log.flush()
+
+# ============================================================================
+# SERVER
+# ============================================================================
+
+class JobServer:
+    """
+    Accept JSON-line jobs on a Unix socket and run them one at a time on the
+    calling thread, which owns whatever warm state handle_job uses.
+
+    Each client sends one request line and receives JSON-line events:
+    queued, progress..., then done (with result) or error. Requests whose
+    'job' is in immediate are answered on the connection thread without queuing.
+    """
+
+    def __init__(self, path, handle_job, immediate=None):
+        self.path = path
+        self.handle_job = handle_job
+        self.immediate = dict(immediate or {})
+        self.immediate.setdefault('status', self.status)
+        self.immediate.setdefault('stop', self.stop)
+        self.jobs = queue.Queue()
+        self.current = None
+        self.completed = 0
+        self.started = time.time()
+        self.stopping = threading.Event()
+        self.server = None
+
+    def status(self):
+        current = self.current.request if self.current else None
+        return {'uptime': round(time.time() - self.started), 'queued': self.jobs.qsize(),
+                'running': current, 'completed': self.completed}
+
+    def stop(self):
+        self.stopping.set()
+        return {'stopping': True}
+
+    def _claim_socket(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        if os.path.exists(self.path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.path)
+                raise RuntimeError(f"a daemon is already listening on {self.path}")
+            except (ConnectionRefusedError, FileNotFoundError):
+                os.unlink(self.path)  # Left behind by a daemon that died
+            finally:
+                probe.close()
+
+    def serve_forever(self):
+        self._claim_socket()
+        server_ref = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def send(self, event):
+                self.wfile.write((json.dumps(event) + "\n").encode())
+                self.wfile.flush()
+
+            def handle(self):
+                try:
+                    request = json.loads(self.rfile.readline())
+                except ValueError as e:
+                    self.send({'event': 'error', 'error': f"bad request: {e}"})
+                    return
+                if not isinstance(request, dict):
+                    self.send({'event': 'error', 'error': "bad request: expected a JSON object"})
+                    return
+
+                name = request.get('job')
+                if name in server_ref.immediate:
+                    self.send({'event': 'done', 'result': server_ref.immediate[name]()})
+                    return
+
+                job = Job(request)
+                server_ref.jobs.put(job)
+                self.send({'event': 'queued', 'job': job.id, 'position': server_ref.jobs.qsize()})
+                try:
+                    while True:
+                        event = job.events.get()
+                        self.send(event)
+                        if event['event'] in FINAL_EVENTS:
+                            break
+                except OSError:
+                    pass  # Client went away; the job still finishes
+
+        self.server = socketserver.ThreadingUnixStreamServer(self.path, Handler)
+        self.server.daemon_threads = True
+        os.chmod(self.path, 0o600)
+        listener = threading.Thread(target=self.server.serve_forever, name='job-socket', daemon=True)
+        listener.start()
+        print(f"🛰️  Listening on {self.path}")
+
+        try:
+            while not self.stopping.is_set():
+                try:
+                    job = self.jobs.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                self.run(job)
+        finally:
+            while not self.jobs.empty():
+                self.jobs.get().report('error', error="daemon stopped before the job ran")
+            self.server.shutdown()
+            self.server.server_close()
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(self.path)
+
+    def run(self, job):
+        self.current = job
+        started = time.time()
+        print(f"\n▶️  Job #{job.id}: {json.dumps(job.request)}")
+        job.report('started', waited=round(started - job.submitted, 3))
+        try:
+            with contextlib.redirect_stdout(JobProgress(job, sys.stdout)):
+                result = self.handle_job(job.request)
+            job.report('done', result=result, seconds=round(time.time() - started, 3))
+        except Exception as e:
+            traceback.print_exc()
+            job.report('error', error=str(e) or type(e).__name__)
+        finally:
+            self.current = None
+            self.completed += 1
+
+# ============================================================================
+# CLIENT
+# ============================================================================
+
+def submit_job(request, path=SOCKET_PATH, on_event=None):
+    """Send one job to the daemon and return its final event; on_event sees every event."""
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(path)
+    except (FileNotFoundError, ConnectionRefusedError):
+        return {'event': 'error', 'error': f"no daemon listening on {path} (start one with `whole.py daemon`)"}
+
+    with client, client.makefile('rwb') as stream:
+        stream.write((json.dumps(request) + "\n").encode())
+        stream.flush()
+        for line in stream:
+            event = json.loads(line)
+            if on_event:
+                on_event(event)
+            if event['event'] in FINAL_EVENTS:
+                return event
+    return {'event': 'error', 'error': "daemon closed the connection"}
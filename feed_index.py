@@ -0,0 +1,200 @@
+import asyncio
+import sqlite3
+import time
+
+# ============================================================================
+# SCHEMA
+# ============================================================================
+
+FEED_INDEX_FILE = "feed_index.db"
+
+# posts holds the rows, posts_fts indexes them (external content, kept in sync by triggers)
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS posts (
+        id INTEGER PRIMARY KEY,
+        fullname TEXT NOT NULL UNIQUE,
+        feeds TEXT NOT NULL,
+        subreddit TEXT NOT NULL,
+        author TEXT,
+        title TEXT NOT NULL,
+        body TEXT,
+        score INTEGER,
+        created REAL,
+        permalink TEXT,
+        indexed_at REAL
+    );
+    CREATE INDEX IF NOT EXISTS idx_posts_created ON posts (created);
+    CREATE INDEX IF NOT EXISTS idx_posts_subreddit ON posts (subreddit, created);
+
+    CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(
+        title, body, subreddit, feeds,
+        content='posts', content_rowid='id', tokenize='porter unicode61'
+    );
+    CREATE TRIGGER IF NOT EXISTS posts_ai AFTER INSERT ON posts BEGIN
+        INSERT INTO posts_fts (rowid, title, body, subreddit, feeds)
+        VALUES (new.id, new.title, new.body, new.subreddit, new.feeds);
+    END;
+    CREATE TRIGGER IF NOT EXISTS posts_ad AFTER DELETE ON posts BEGIN
+        INSERT INTO posts_fts (posts_fts, rowid, title, body, subreddit, feeds)
+        VALUES ('delete', old.id, old.title, old.body, old.subreddit, old.feeds);
+    END;
+    CREATE TRIGGER IF NOT EXISTS posts_au AFTER UPDATE ON posts BEGIN
+        INSERT INTO posts_fts (posts_fts, rowid, title, body, subreddit, feeds)
+        VALUES ('delete', old.id, old.title, old.body, old.subreddit, old.feeds);
+        INSERT INTO posts_fts (rowid, title, body, subreddit, feeds)
+        VALUES (new.id, new.title, new.body, new.subreddit, new.feeds);
+    END;
+
+    CREATE TABLE IF NOT EXISTS cursors (
+        subreddit TEXT PRIMARY KEY,
+        newest TEXT,
+        newest_created REAL,
+        updated REAL
+    );
+"""
+
+UPSERT_POST = """
+    INSERT INTO posts (fullname, feeds, subreddit, author, title, body, score, created, permalink, indexed_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (fullname) DO UPDATE SET
+        feeds = excluded.feeds, title = excluded.title, body = excluded.body,
+        score = excluded.score, indexed_at = excluded.indexed_at
+"""
+
+# bm25 column weights: title, body, subreddit, feeds
+RANK = "bm25(posts_fts, 10.0, 1.0, 2.0, 0.0)"
+SORT_ORDERS = {
+    'relevance': f"{RANK}",
+    'score': "p.score DESC",
+    'new': "p.created DESC",
+}
+
+def open_index(path=FEED_INDEX_FILE):
+    """Open (creating if needed) the feed index database."""
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+# ============================================================================
+# INGEST
+# ============================================================================
+
+def subreddit_feeds(feeds_data):
+    """Map each lowercased subreddit to the comma-joined names of the feeds containing it."""
+    memberships = {}
+    for feed_name, subreddits in feeds_data.items():
+        for subreddit in subreddits:
+            memberships.setdefault(subreddit.lower(), []).append(feed_name)
+    return {subreddit: ",".join(names) for subreddit, names in memberships.items()}
+
+def post_row(post, feeds, now):
+    return (
+        post["name"],
+        feeds,
+        post.get("subreddit", ""),
+        post.get("author"),
+        post.get("title", ""),
+        post.get("selftext", ""),
+        post.get("score"),
+        post.get("created_utc"),
+        post.get("permalink"),
+        now,
+    )
+
+async def fetch_new_posts(reader, subreddit, cursor, max_pages):
+    """
+    Newest-first posts of subreddit that are newer than cursor
+    ((fullname, created) of the newest post already indexed, or None).
+    """
+    from feed_reader import subreddits_listing_path
+
+    newest, newest_created = cursor or (None, None)
+    posts = []
+    async for post in reader.iter_posts(subreddits_listing_path([subreddit], "new"), max_pages):
+        if post.get("name") == newest:
+            break
+        # The cursor post may have been deleted, so the timestamp is the real boundary
+        if newest_created is not None and (post.get("created_utc") or 0) < newest_created:
+            break
+        posts.append(post)
+    return posts
+
+def ingest_feeds(feeds_data, db_path=FEED_INDEX_FILE, max_pages=1, rate=1.0):
+    """
+    Fetch posts newer than each subreddit's cursor and upsert them into the index.
+    The first run for a subreddit reads max_pages of /new; later runs read
+    until they reach the previous newest post (at most 10 pages).
+    Returns {subreddit: new posts}.
+    """
+    import requests
+    from feed_reader import FeedReader
+
+    feeds_by_subreddit = subreddit_feeds(feeds_data)
+    conn = open_index(db_path)
+    cursors = {row[0]: (row[1], row[2]) for row in conn.execute("SELECT subreddit, newest, newest_created FROM cursors")}
+    counts = {}
+
+    async def ingest_one(reader, subreddit):
+        cursor = cursors.get(subreddit)
+        try:
+            posts = await fetch_new_posts(reader, subreddit, cursor, 10 if cursor else max_pages)
+        except (requests.RequestException, ValueError) as e:
+            print(f"❌ r/{subreddit}: {str(e)[:100]}")
+            return
+
+        now = time.time()
+        with conn:
+            conn.executemany(UPSERT_POST, [post_row(post, feeds_by_subreddit[subreddit], now) for post in posts])
+            if posts:
+                conn.execute(
+                    "INSERT INTO cursors (subreddit, newest, newest_created, updated) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (subreddit) DO UPDATE SET newest = excluded.newest, "
+                    "newest_created = excluded.newest_created, updated = excluded.updated",
+                    (subreddit, posts[0]["name"], posts[0].get("created_utc"), now))
+        counts[subreddit] = len(posts)
+        print(f"  📥 r/{subreddit}: {len(posts)} new")
+
+    async def run():
+        reader = FeedReader(rate=rate, pool_size=10)
+        await asyncio.gather(*(ingest_one(reader, subreddit) for subreddit in feeds_by_subreddit))
+
+    print(f"📚 Indexing {len(feeds_by_subreddit)} subreddits from {len(feeds_data)} feeds into {db_path}...")
+    asyncio.run(run())
+    total = conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+    conn.close()
+    print(f"\n📊 {sum(counts.values())} new posts, {total} indexed")
+    return counts
+
+# ============================================================================
+# SEARCH
+# ============================================================================
+
+def search_index(query, db_path=FEED_INDEX_FILE, feed=None, subreddit=None, sort='relevance', limit=20):
+    """Run an FTS5 query against the index. Returns a list of result dicts."""
+    clauses = ["posts_fts MATCH ?"]
+    params = [query]
+    if feed:
+        clauses.append("instr(',' || p.feeds || ',', ?) > 0")
+        params.append(f",{feed},")
+    if subreddit:
+        clauses.append("p.subreddit = ? COLLATE NOCASE")
+        params.append(subreddit)
+
+    sql = f"""
+        SELECT p.fullname, p.feeds, p.subreddit, p.score, p.created, p.title, p.permalink,
+               snippet(posts_fts, -1, '[', ']', '…', 12)
+        FROM posts_fts JOIN posts p ON p.id = posts_fts.rowid
+        WHERE {' AND '.join(clauses)}
+        ORDER BY {SORT_ORDERS[sort]}
+        LIMIT ?
+    """
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        rows = conn.execute(sql, params + [limit]).fetchall()
+    finally:
+        conn.close()
+
+    keys = ['fullname', 'feeds', 'subreddit', 'score', 'created', 'title', 'permalink', 'snippet']
+    return [dict(zip(keys, row)) for row in rows]
@@ -0,0 +1,192 @@
+import requests
+import asyncio
+import collections
+import json
+import os
+import time
+
+from reddit_api import BASE_URL, create_session, get_json
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+PAGE_LIMIT = 100
+CACHE_TTL = 60  # seconds a listing page is reused
+CACHE_SIZE = 256  # listing pages kept
+CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "reddit-custom-feed", "listings.json")
+
+# ============================================================================
+# RATE BUDGET AND CACHE
+# ============================================================================
+
+class RateBudget:
+    """Token bucket shared by every concurrent fetch."""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until one request may be sent."""
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+class ListingCache:
+    """
+    LRU of listing pages, keyed by listing URL, that expire after ttl seconds.
+    With a path, pages still fresh are loaded from and saved to that JSON
+    file, so one-shot commands run close together share them.
+    """
+
+    def __init__(self, max_entries=CACHE_SIZE, ttl=CACHE_TTL, path=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self.entries = collections.OrderedDict()
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    for key, stored_at, value in json.load(f):
+                        if not self.expired(stored_at):
+                            self.entries[key] = (stored_at, value)
+            except (OSError, ValueError):
+                self.entries.clear()
+
+    def expired(self, stored_at):
+        return time.time() - stored_at > self.ttl
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if self.expired(stored_at):
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self.entries[key] = (time.time(), value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def save(self):
+        """Write the fresh pages to path (no-op for an in-memory cache)."""
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump([[key, stored_at, value] for key, (stored_at, value) in self.entries.items()
+                       if not self.expired(stored_at)], f)
+        os.replace(tmp_path, self.path)
+
+# ============================================================================
+# LISTING PATHS
+# ============================================================================
+
+def feed_listing_path(username, feed_slug, sort):
+    """Listing path of a custom feed."""
+    return f"/user/{username}/m/{feed_slug}/{sort}.json"
+
+def subreddits_listing_path(subreddits, sort):
+    """Listing path combining several subreddits (r/a+b+c)."""
+    return f"/r/{'+'.join(subreddits)}/{sort}.json"
+
+# ============================================================================
+# FEED READER
+# ============================================================================
+
+class FeedReader:
+    """
+    Async reader for Reddit listings.
+    Blocking HTTP runs in worker threads on one pooled session, so any number
+    of listings can be paged concurrently under a single RateBudget.
+    """
+
+    def __init__(self, rate=1.0, burst=5, pool_size=20, cache=None, base_url=BASE_URL):
+        self.base_url = base_url
+        self.budget = RateBudget(rate, burst)
+        self.cache = cache or ListingCache()
+        self.session = create_session(pool_size)
+
+    def _get_json(self, path, params):
+        return get_json(self.session, path, params, self.base_url)
+
+    async def fetch_page(self, path, after=None, limit=PAGE_LIMIT):
+        """Fetch one listing page, served from cache while fresh."""
+        key = f"{self.base_url}{path}?limit={limit}&after={after or ''}"
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        params = {"limit": limit, "raw_json": 1}
+        if after:
+            params["after"] = after
+
+        await self.budget.acquire()
+        page = await asyncio.to_thread(self._get_json, path, params)
+        self.cache.put(key, page)
+        return page
+
+    async def iter_posts(self, path, max_pages=1):
+        """Lazily yield posts from path, following the after cursor."""
+        after = None
+        for _ in range(max_pages):
+            listing = (await self.fetch_page(path, after)).get("data", {})
+            for child in listing.get("children", []):
+                yield child.get("data", {})
+
+            after = listing.get("after")
+            if not after:
+                break
+
+    async def stream(self, paths, max_pages=1):
+        """
+        Page through every path concurrently and yield (name, post) as posts
+        arrive. paths maps a display name to a listing path. Posts seen under
+        an earlier name are not repeated.
+        """
+        results = asyncio.Queue()
+        done = object()
+
+        async def produce(name, path):
+            try:
+                async for post in self.iter_posts(path, max_pages):
+                    await results.put((name, post))
+            except (requests.RequestException, ValueError) as e:
+                print(f"❌ {name}: {str(e)[:100]}")
+            finally:
+                await results.put(done)
+
+        tasks = [asyncio.create_task(produce(name, path)) for name, path in paths.items()]
+        remaining = len(tasks)
+        seen = set()
+
+        try:
+            while remaining:
+                item = await results.get()
+                if item is done:
+                    remaining -= 1
+                    continue
+                name, post = item
+                if post.get("name") in seen:
+                    continue
+                seen.add(post.get("name"))
+                yield name, post
+        finally:
+            for task in tasks:
+                task.cancel()
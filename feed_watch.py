@@ -0,0 +1,176 @@
+import ctypes
+import ctypes.util
+import hashlib
+import json
+import os
+import re
+import select
+import struct
+import time
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+DEBOUNCE = 0.5  # Seconds without further writes before an edit is applied
+POLL_INTERVAL = 0.5  # Used when inotify is unavailable
+
+# inotify(7) constants
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+EVENT_HEADER = struct.Struct('iIII')
+
+SECTION_HEADER = re.compile(r'^==\s+(.+?)\s*$')
+SUBREDDIT_LINE = re.compile(r'^\s*(?:[*-]\s*)?/?r/([A-Za-z0-9_]+)\s*$')
+
+# ============================================================================
+# SPEC PARSING
+# ============================================================================
+
+def split_adoc_sections(text):
+    """Split an AsciiDoc spec into {section title: section text} at '== Title' lines."""
+    sections = {}
+    title = None
+    for line in text.splitlines():
+        match = SECTION_HEADER.match(line)
+        if match:
+            title = match.group(1)
+            sections[title] = []
+        elif title is not None:
+            sections[title].append(line)
+    return {title: "\n".join(lines) for title, lines in sections.items()}
+
+def parse_adoc_section(text):
+    """Subreddit names listed as 'r/name' lines in one section."""
+    return [match.group(1) for match in map(SUBREDDIT_LINE.match, text.splitlines()) if match]
+
+class SpecReader:
+    """
+    Reads a feed spec (JSON like FEEDS_DATA, or AsciiDoc with '== Feed'
+    sections of 'r/sub' lines) and reparses only the AsciiDoc sections whose
+    text changed since the last read.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.sections = {}  # title -> (digest of section text, parsed subreddits)
+
+    def read(self):
+        """Return a fresh {feed: [subreddits]} dict for the file as it is now."""
+        with open(self.path, 'r') as f:
+            text = f.read()
+
+        if not self.path.endswith('.adoc'):
+            return json.loads(text)
+
+        sections = {}
+        for title, body in split_adoc_sections(text).items():
+            digest = hashlib.sha1(body.encode()).hexdigest()
+            cached = self.sections.get(title)
+            sections[title] = cached if cached and cached[0] == digest else (digest, parse_adoc_section(body))
+        self.sections = sections
+
+        # Sections without any subreddit (notes, recorded requests) are not feeds
+        return {title: list(subs) for title, (_, subs) in sections.items() if subs}
+
+def diff_specs(old, new):
+    """
+    Compare two {feed: [subreddits]} specs. Returns (added feeds, removed feeds,
+    {feed: (subreddits added, subreddits removed)} for feeds present in both).
+    """
+    added = [name for name in new if name not in old]
+    removed = [name for name in old if name not in new]
+    changed = {}
+    for name in new:
+        if name in old:
+            before, after = set(old[name]), set(new[name])
+            if before != after:
+                changed[name] = (sorted(after - before), sorted(before - after))
+    return added, removed, changed
+
+# ============================================================================
+# FILE WATCHERS
+# ============================================================================
+
+class InotifyWatcher:
+    """Wait for writes to one file with inotify, watching its directory so editor rename-saves are seen."""
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        self.name = os.path.basename(self.path).encode()
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+        if libc.inotify_add_watch(self.fd, os.path.dirname(self.path).encode(), mask) < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), "inotify_add_watch failed")
+
+    def wait(self, timeout=None):
+        """True if the file changed within timeout seconds (None waits forever)."""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return False
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return False
+
+        offset = 0
+        changed = False
+        while offset < len(data):
+            _, _, _, length = EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length].rstrip(b'\0')
+            changed = changed or name == self.name
+            offset += EVENT_HEADER.size + length
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+class PollingWatcher:
+    """Fallback watcher comparing mtime and size every POLL_INTERVAL seconds."""
+
+    def __init__(self, path):
+        self.path = path
+        self.last = self.stamp()
+
+    def stamp(self):
+        try:
+            stat = os.stat(self.path)
+            return stat.st_mtime_ns, stat.st_size
+        except FileNotFoundError:
+            return None
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while deadline is None or time.monotonic() < deadline:
+            current = self.stamp()
+            if current != self.last:
+                self.last = current
+                return True
+            remaining = POLL_INTERVAL if deadline is None else min(POLL_INTERVAL, deadline - time.monotonic())
+            time.sleep(max(0, remaining))
+        return False
+
+    def close(self):
+        pass
+
+def create_watcher(path):
+    """inotify where available, polling everywhere else."""
+    try:
+        return InotifyWatcher(path)
+    except (OSError, AttributeError):
+        return PollingWatcher(path)
+
+def wait_for_edit(watcher, debounce=DEBOUNCE):
+    """Block until the file changes, then until it has been quiet for debounce seconds."""
+    while not watcher.wait():
+        pass
+    while watcher.wait(debounce):
+        pass
@@ -0,0 +1,163 @@
+import argparse
+import collections
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from network_debugger import load_captured_data
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+DEFAULT_PORT = 8800
+
+# Recorded headers that would be wrong once the body is re-serialised
+SKIPPED_HEADERS = {'content-length', 'content-encoding', 'transfer-encoding', 'connection', 'keep-alive'}
+
+# Served for unrecorded page loads, so scripts can still find a CSRF token
+STUB_PAGE = """<!DOCTYPE html>
+<html><head><title>reddit fixture</title></head>
+<body><script>window.__fixture = true; var config = {"csrf_token":"fixture-csrf-token"};</script></body></html>
+"""
+
+# ============================================================================
+# MATCHING
+# ============================================================================
+
+def request_keys(method, url, body):
+    """
+    Lookup keys for a request, most specific first:
+    (method, path, operation, variables), (method, path, operation), (method, path).
+    """
+    parts = urlsplit(url)
+    path = parts.path + (f"?{parts.query}" if parts.query else "")
+    operation = variables = None
+    if isinstance(body, dict):
+        operation = body.get('operation') or body.get('operationName')
+        variables = json.dumps(body.get('variables'), sort_keys=True)
+
+    keys = []
+    if operation is not None:
+        keys.append((method, path, operation, variables))
+        keys.append((method, path, operation))
+    keys.append((method, path))
+    if parts.query:
+        keys.append((method, parts.path))
+    return keys
+
+class FixtureIndex:
+    """
+    Recorded responses grouped by request key. Repeated identical requests
+    are answered with the recorded responses in order, then the last one again.
+    """
+
+    def __init__(self, captured):
+        self.responses = collections.defaultdict(list)
+        self.cursors = collections.Counter()
+        self.lock = threading.Lock()
+
+        for req_resp in captured:
+            request = req_resp.get('request', {})
+            response = req_resp.get('response', {})
+            if 'status' not in response:
+                continue
+            for key in request_keys(request.get('method', 'GET'), request.get('url', ''), request.get('body')):
+                self.responses[key].append(response)
+
+    def lookup(self, method, url, body):
+        """Return the recorded response for a request, or None."""
+        with self.lock:
+            for key in request_keys(method, url, body):
+                recorded = self.responses.get(key)
+                if recorded:
+                    index = min(self.cursors[key], len(recorded) - 1)
+                    self.cursors[key] += 1
+                    return recorded[index]
+        return None
+
+# ============================================================================
+# HTTP SERVER
+# ============================================================================
+
+def create_handler(index, latency):
+    """Build a request handler class bound to index. latency scales recorded durations (0 = none)."""
+
+    class FixtureHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def handle_any(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            raw_body = self.rfile.read(length) if length else b''
+            try:
+                body = json.loads(raw_body) if raw_body else None
+            except ValueError:
+                body = raw_body.decode(errors='replace')
+
+            response = index.lookup(self.command, self.path, body)
+            if response is None:
+                if self.command == 'GET' and 'text/html' in self.headers.get('Accept', ''):
+                    self.send_body(200, {'Content-Type': 'text/html; charset=utf-8',
+                                         'Set-Cookie': 'csrf_token=fixture-csrf-token; Path=/'}, STUB_PAGE)
+                else:
+                    self.send_body(404, {'Content-Type': 'application/json'},
+                                   json.dumps({'error': 'no recorded response', 'path': self.path}))
+                return
+
+            if latency and response.get('duration'):
+                time.sleep(response['duration'] / 1000 * latency)
+
+            recorded_body = response.get('body')
+            payload = recorded_body if isinstance(recorded_body, str) else json.dumps(recorded_body)
+            headers = {key: value for key, value in (response.get('headers') or {}).items()
+                       if key.lower() not in SKIPPED_HEADERS}
+            headers.setdefault('content-type', 'application/json' if not isinstance(recorded_body, str) else 'text/plain')
+            self.send_body(response['status'], headers, payload)
+
+        def send_body(self, status, headers, payload):
+            data = payload.encode()
+            self.send_response(status)
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            print(f"🎞️  {self.command} {self.path} -> {args[1] if len(args) > 1 else ''}")
+
+        do_GET = do_POST = do_PUT = do_DELETE = do_PATCH = do_OPTIONS = handle_any
+
+    return FixtureHandler
+
+def create_serve_parser():
+    """Create the argument parser for the serve subcommand."""
+    parser = argparse.ArgumentParser(prog='network_debugger.py serve',
+                                     description='Replay a saved capture file as a local HTTP server')
+    parser.add_argument('captures', help='File written by network_debugger.py --save')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'Port (default: {DEFAULT_PORT})')
+    parser.add_argument('--latency',
+                        type=float,
+                        default=0.0,
+                        nargs='?',
+                        const=1.0,
+                        help='Delay responses by their recorded duration, optionally scaled (e.g. --latency 0.5)')
+    return parser
+
+def serve_main(argv):
+    """Entry point for `network_debugger.py serve ...`."""
+    args = create_serve_parser().parse_args(argv)
+    index = FixtureIndex(load_captured_data(args.captures))
+    server = ThreadingHTTPServer((args.host, args.port), create_handler(index, args.latency))
+
+    print(f"🎬 Replaying {len(index.responses)} request keys from {args.captures}")
+    print(f"🌐 http://{args.host}:{args.port}/  (point scripts at it with REDDIT_BASE_URL=http://{args.host}:{args.port})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stopped")
+    finally:
+        server.server_close()
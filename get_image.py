@@ -1,17 +1,365 @@
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
 
-url = "https://i.redd.it/xwkw3mdy516g1.jpeg"
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+DEFAULT_URL = "https://i.redd.it/xwkw3mdy516g1.jpeg"
 
 # Pretend to be a normal script, not a browser
-headers = {
+HEADERS = {
     "User-Agent": "curl/8.0",
 }
 
-r = requests.get(url, headers=headers)
+CHUNK_SIZE = 64 * 1024
+PARTIAL_DIR = ".partial"
+CACHE_INDEX_FILE = ".media-cache.json"
+
+EXTENSIONS = {
+    "image/jpeg": ".jpeg",
+    "image/png": ".png",
+    "image/gif": ".gif",
+    "image/webp": ".webp",
+}
+
+# ============================================================================
+# COMMAND LINE ARGUMENT PARSER
+# ============================================================================
+
+def create_parser():
+    """Create and return the argument parser."""
+    parser = argparse.ArgumentParser(description='Download Reddit media (i.redd.it) concurrently')
+
+    parser.add_argument('urls', nargs='*', help=f'Media URLs to download (default: {DEFAULT_URL})')
+
+    parser.add_argument('--file', '-f', help='Read URLs from a file, one per line (# starts a comment)')
+
+    parser.add_argument('--out', '-o', default='.', help='Directory to save files into (default: current directory)')
+
+    parser.add_argument('--workers', '-w', type=int, default=4, help='Concurrent downloads (default: 4)')
+
+    parser.add_argument('--max-cache-mb',
+                        type=float,
+                        help='Evict least recently used files once the output directory exceeds this size')
+
+    parser.add_argument('--no-cache', action='store_true', help='Ignore cached validators and download everything again')
+
+    return parser
+
+def read_urls(args):
+    """Collect URLs from the command line and --file, dropping blanks and repeats."""
+    urls = list(args.urls)
+
+    if args.file:
+        with open(args.file, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    urls.append(line)
+
+    if not urls:
+        urls = [DEFAULT_URL]
+
+    # Keep first occurrence order
+    return list(dict.fromkeys(normalize_media_url(url) for url in urls))
+
+def normalize_media_url(url):
+    """Rewrite preview.redd.it links to i.redd.it, which Reddit blocks far less often."""
+    parts = urlsplit(url)
+    if parts.hostname == "preview.redd.it":
+        return f"https://i.redd.it{parts.path}"
+    return url
+
+# ============================================================================
+# MEDIA CACHE
+# ============================================================================
+
+class MediaCache:
+    """
+    URL-keyed index of downloaded files, stored as JSON next to the files.
+    Keeps ETag/Last-Modified per URL for conditional revalidation and a
+    last-used time for LRU eviction.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.index_path = os.path.join(directory, CACHE_INDEX_FILE)
+        self.entries = {}
+        self.lock = threading.Lock()
+
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, 'r') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Ignoring unreadable cache index: {e}")
+
+    def lookup(self, url):
+        """Return the entry for url if its file is still on disk."""
+        with self.lock:
+            entry = self.entries.get(url)
+        if entry and os.path.exists(entry['path']):
+            return entry
+        return None
+
+    def conditional_headers(self, entry):
+        """Build If-None-Match/If-Modified-Since headers from a cache entry."""
+        headers = {}
+        if entry.get('etag'):
+            headers["If-None-Match"] = entry['etag']
+        if entry.get('last_modified'):
+            headers["If-Modified-Since"] = entry['last_modified']
+        return headers
+
+    def record(self, url, path, response_headers):
+        """
+        Store path and validators for url. If url used to point at another
+        file that no other URL shares, that file is deleted so it does not
+        linger outside the index and the LRU cap.
+        """
+        with self.lock:
+            previous = self.entries.get(url)
+            if previous and previous['path'] != path and \
+                    not any(other != url and entry['path'] == previous['path'] for other, entry in self.entries.items()):
+                try:
+                    os.remove(previous['path'])
+                except FileNotFoundError:
+                    pass
+            self.entries[url] = {
+                'path': path,
+                'etag': response_headers.get("ETag"),
+                'last_modified': response_headers.get("Last-Modified"),
+                'size': os.path.getsize(path),
+                'last_used': time.time(),
+            }
+
+    def touch(self, url):
+        """Mark url as just used."""
+        with self.lock:
+            if url in self.entries:
+                self.entries[url]['last_used'] = time.time()
+
+    def evict(self, max_bytes):
+        """Delete least recently used files until the cached files fit in max_bytes."""
+        with self.lock:
+            # Several URLs can point at one content-addressed file
+            files = {}
+            for url, entry in self.entries.items():
+                info = files.setdefault(entry['path'], {'size': entry['size'], 'last_used': 0, 'urls': []})
+                info['last_used'] = max(info['last_used'], entry['last_used'])
+                info['urls'].append(url)
+
+            total = sum(info['size'] for info in files.values())
+            evicted = 0
+            for path, info in sorted(files.items(), key=lambda item: item[1]['last_used']):
+                if total <= max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                for url in info['urls']:
+                    del self.entries[url]
+                total -= info['size']
+                evicted += 1
+
+        return evicted
+
+    def save(self):
+        """Write the index back to disk."""
+        with self.lock:
+            tmp_path = self.index_path + ".tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(self.entries, f, indent=2)
+            os.replace(tmp_path, self.index_path)
+
+# ============================================================================
+# DOWNLOADING
+# ============================================================================
+
+def create_session(pool_size):
+    """Create a requests session whose connection pool fits pool_size workers."""
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def partial_path(out_dir, url):
+    """Path of the in-progress download for url (stable across runs so it can resume)."""
+    url_key = hashlib.sha1(url.encode()).hexdigest()[:16]
+    return os.path.join(out_dir, PARTIAL_DIR, f"{url_key}.part")
+
+def resume_validator(part):
+    """
+    If-Range value for resuming part: the ETag or Last-Modified of the
+    response that started it, or None if the partial file cannot be trusted.
+    """
+    try:
+        with open(part + ".json", 'r') as f:
+            validators = json.load(f)
+    except (OSError, ValueError):
+        return None
+    # Weak ETags are not allowed in If-Range
+    etag = validators.get('etag')
+    if etag and not etag.startswith('W/'):
+        return etag
+    return validators.get('last_modified')
+
+def save_resume_validators(part, response_headers):
+    with open(part + ".json", 'w') as f:
+        json.dump({'etag': response_headers.get("ETag"), 'last_modified': response_headers.get("Last-Modified")}, f)
+
+def remove_partial(part):
+    for path in (part, part + ".json"):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+def guess_extension(content_type, url):
+    """Pick a file extension from the Content-Type, falling back to the URL."""
+    mime = content_type.split(';')[0].strip().lower()
+    if mime in EXTENSIONS:
+        return EXTENSIONS[mime]
+    ext = os.path.splitext(url.split('?')[0])[1]
+    return ext if ext else ".bin"
+
+def hash_file(path, digest):
+    """Feed an existing file into digest in chunks."""
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+
+def download_media(session, url, out_dir, cache=None):
+    """
+    Stream url to disk, resuming a previous partial download if there is one.
+    A resume sends If-Range with the validator of the response that started
+    the partial file, so a changed file is downloaded from scratch instead of
+    being spliced onto the old prefix. The finished file is named by its SHA-256 so identical media is stored once.
+    With a cache, a previously downloaded URL is revalidated and a 304 is
+    served from disk.
+    Returns (status, detail) where status is 'saved', 'duplicate', 'cached' or 'error'.
+    """
+    part = partial_path(out_dir, url)
+    offset = os.path.getsize(part) if os.path.exists(part) else 0
+    validator = resume_validator(part) if offset else None
+    if offset and not validator:
+        # Nothing to tell whether the remote file is still the same one
+        remove_partial(part)
+        offset = 0
+    cached = cache.lookup(url) if cache and not offset else None
+
+    headers = {}
+    if offset:
+        headers["Range"] = f"bytes={offset}-"
+        headers["If-Range"] = validator
+    elif cached:
+        headers.update(cache.conditional_headers(cached))
+
+    with session.get(url, headers=headers, stream=True, timeout=30) as r:
+        if r.status_code == 304 and cached:
+            cache.touch(url)
+            return 'cached', cached['path']
+
+        # Partial file is already complete (or stale) - start over
+        if r.status_code == 416:
+            remove_partial(part)
+            return download_media(session, url, out_dir, cache)
+
+        content_type = r.headers.get("Content-Type", "")
+        if r.status_code not in (200, 206) or not content_type.startswith("image"):
+            return 'error', f"Reddit returned: {r.status_code} {content_type}"
+
+        digest = hashlib.sha256()
+        if r.status_code == 206:
+            hash_file(part, digest)
+            mode = 'ab'
+        else:
+            # Fresh download, a server that ignored Range, or If-Range saw a changed file: start over
+            mode = 'wb'
+            save_resume_validators(part, r.headers)
+
+        with open(part, mode) as f:
+            for chunk in r.iter_content(CHUNK_SIZE):
+                f.write(chunk)
+                digest.update(chunk)
+
+    final_path = os.path.join(out_dir, digest.hexdigest()[:32] + guess_extension(content_type, url))
+    if os.path.exists(final_path):
+        os.remove(part)
+        status = 'duplicate'
+    else:
+        os.replace(part, final_path)
+        status = 'saved'
+    remove_partial(part)
+
+    if cache:
+        cache.record(url, final_path, r.headers)
+    return status, final_path
+
+def download_all(urls, out_dir, workers, cache=None):
+    """Download urls with bounded concurrency. Returns {url: (status, detail)}."""
+    os.makedirs(os.path.join(out_dir, PARTIAL_DIR), exist_ok=True)
+    session = create_session(workers)
+    results = {}
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(download_media, session, url, out_dir, cache): url for url in urls}
+        for future in as_completed(futures):
+            url = futures[future]
+            try:
+                status, detail = future.result()
+            except requests.RequestException as e:
+                # Whatever arrived stays in .partial and is resumed next run
+                status, detail = 'error', str(e)[:100]
+            results[url] = (status, detail)
+
+            if status == 'saved':
+                print(f"✅ {url} -> {detail}")
+            elif status == 'duplicate':
+                print(f"♻️  {url} -> {detail} (already have it)")
+            elif status == 'cached':
+                print(f"💾 {url} -> {detail} (not modified)")
+            else:
+                print(f"❌ {url}: {detail}")
+
+    return results
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    """Download every URL given on the command line or in --file."""
+    args = create_parser().parse_args()
+    urls = read_urls(args)
+
+    print(f"📥 Downloading {len(urls)} file(s) with {args.workers} worker(s)...\n")
+    os.makedirs(args.out, exist_ok=True)
+    cache = MediaCache(args.out)
+    results = download_all(urls, args.out, args.workers, None if args.no_cache else cache)
+
+    if args.max_cache_mb is not None:
+        evicted = cache.evict(int(args.max_cache_mb * 1024 * 1024))
+        if evicted:
+            print(f"🧹 Evicted {evicted} least recently used file(s)")
+    cache.save()
+
+    failed = sum(1 for status, _ in results.values() if status == 'error')
+    print(f"\n📊 {len(results) - failed} ok, {failed} failed")
+    sys.exit(1 if failed else 0)
 
-if r.status_code == 200 and r.headers.get("Content-Type", "").startswith("image"):
-    with open("image.jpeg", "wb") as f:
-        f.write(r.content)
-    print("Saved as image.jpeg")
-else:
-    print("Reddit returned:", r.status_code, r.headers.get("Content-Type"))
+if __name__ == "__main__":
+    main()
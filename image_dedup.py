@@ -0,0 +1,228 @@
+from PIL import Image
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import argparse
+import json
+import os
+import shutil
+import time
+
+from process_images import find_images
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+HASH_SIZE = 8  # 8x8 gradient bits -> one uint64 per image
+DEFAULT_THRESHOLD = 6  # Max differing bits for two images to count as the same picture
+CACHE_FILE = ".dhash-cache.npz"
+COMPARE_CHUNK = 1024  # Rows compared at once inside one bucket, bounds the distance matrix
+
+# ============================================================================
+# COMMAND LINE ARGUMENT PARSER
+# ============================================================================
+
+def create_parser():
+    """Create and return the argument parser."""
+    parser = argparse.ArgumentParser(description='Find re-encoded and resized copies among downloaded images')
+
+    parser.add_argument('input', nargs='?', default='.', help='Directory of downloaded images (default: current directory)')
+
+    parser.add_argument('--threshold',
+                        '-t',
+                        type=int,
+                        default=DEFAULT_THRESHOLD,
+                        help=f'Max Hamming distance between 64-bit dHashes (default: {DEFAULT_THRESHOLD})')
+
+    parser.add_argument('--move', metavar='DIR', help='Move every duplicate (all but the largest copy) into DIR')
+
+    parser.add_argument('--json', action='store_true', help='Print duplicate groups as JSON')
+
+    parser.add_argument('--no-cache', action='store_true', help=f'Rehash everything instead of reusing {CACHE_FILE}')
+
+    parser.add_argument('--workers', '-w', type=int, default=os.cpu_count(), help='Worker processes (default: all cores)')
+
+    return parser
+
+# ============================================================================
+# HASHING
+# ============================================================================
+
+def dhash(path):
+    """
+    Difference hash of path: grey 9x8 thumbnail, one bit per horizontal
+    gradient. Returns (path, hash as int or None, pixel count).
+    """
+    try:
+        with Image.open(path) as img:
+            pixels = img.width * img.height
+            # JPEGs decode straight to a tiny greyscale image
+            img.draft('L', (HASH_SIZE * 4, HASH_SIZE * 4))
+            small = img.convert('L').resize((HASH_SIZE + 1, HASH_SIZE), Image.Resampling.BILINEAR)
+    except (OSError, ValueError):
+        return path, None, 0
+
+    grey = np.asarray(small, dtype=np.int16)
+    bits = np.packbits(grey[:, 1:] > grey[:, :-1])
+    return path, int.from_bytes(bits.tobytes(), 'big'), pixels
+
+def load_cache(path):
+    """Return {image path: (mtime, hash, pixels)} from a cache file, or {}."""
+    if not os.path.exists(path):
+        return {}
+    with np.load(path) as data:
+        return {p: (m, h, px) for p, m, h, px in zip(data['paths'].tolist(), data['mtimes'].tolist(),
+                                                     data['hashes'].tolist(), data['pixels'].tolist())}
+
+def save_cache(path, paths, mtimes, hashes, pixels):
+    np.savez(path, paths=np.array(paths), mtimes=mtimes, hashes=hashes, pixels=pixels)
+
+def hash_images(paths, workers, cache_path=None):
+    """
+    dHash every image on a process pool, reusing cached hashes of unchanged
+    files. Returns (paths, hashes as uint64 array, pixel counts, number
+    hashed now) for the images that could be decoded.
+    """
+    cached = load_cache(cache_path) if cache_path else {}
+    mtimes = {path: os.path.getmtime(path) for path in paths}
+    results = {}
+    todo = []
+    for path in paths:
+        entry = cached.get(path)
+        if entry and entry[0] == mtimes[path]:
+            results[path] = (entry[1], entry[2])
+        else:
+            todo.append(path)
+
+    if todo:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for path, value, pixels in pool.map(dhash, todo, chunksize=max(1, len(todo) // (workers * 4))):
+                if value is None:
+                    print(f"  ❌ {os.path.basename(path)}: cannot decode")
+                    continue
+                results[path] = (value, pixels)
+
+    kept = [path for path in paths if path in results]
+    hashes = np.array([results[path][0] for path in kept], dtype=np.uint64)
+    pixels = np.array([results[path][1] for path in kept], dtype=np.int64)
+
+    if cache_path:
+        save_cache(cache_path, kept, np.array([mtimes[path] for path in kept], dtype=np.float64), hashes, pixels)
+    return kept, hashes, pixels, len(todo)
+
+# ============================================================================
+# NEAR-DUPLICATE SEARCH
+# ============================================================================
+
+if hasattr(np, 'bitwise_count'):
+    popcount = np.bitwise_count
+else:
+    _BYTE_BITS = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+    def popcount(values):
+        return _BYTE_BITS[values.view(np.uint8)].reshape(values.shape + (8,)).sum(axis=-1)
+
+def band_masks(threshold, bits=64):
+    """
+    Split the hash into threshold + 1 bands. Two hashes within threshold bits
+    must agree exactly on at least one band (pigeonhole), so only images
+    sharing a band value are ever compared.
+    """
+    bands = threshold + 1
+    edges = np.linspace(0, bits, bands + 1).astype(int)
+    return [(int(low), (1 << int(high - low)) - 1) for low, high in zip(edges[:-1], edges[1:])]
+
+def near_duplicate_pairs(hashes, threshold):
+    """Return (i, j, distance) for every pair of hashes at most threshold bits apart."""
+    pairs = {}
+    for shift, mask in band_masks(threshold):
+        keys = (hashes >> np.uint64(shift)) & np.uint64(mask)
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        ends = np.r_[starts[1:], len(order)]
+
+        for start, end in zip(starts, ends):
+            if end - start < 2:
+                continue
+            members = order[start:end]
+            bucket = hashes[members]
+            for row in range(0, len(members), COMPARE_CHUNK):
+                block = bucket[row:row + COMPARE_CHUNK]
+                distances = popcount(block[:, None] ^ bucket[None, :])
+                for a, b in zip(*np.nonzero(distances <= threshold)):
+                    i, j = members[row + a], members[b]
+                    if i < j:
+                        pairs[(int(i), int(j))] = int(distances[a, b])
+    return [(i, j, d) for (i, j), d in pairs.items()]
+
+def group_duplicates(count, pairs):
+    """Union-find the pairs into groups of indices (only groups of two or more)."""
+    parent = list(range(count))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j, _ in pairs:
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            parent[root_j] = root_i
+
+    groups = {}
+    for i, _, _ in pairs:
+        groups.setdefault(find(i), set())
+    for i in range(count):
+        root = find(i)
+        if root in groups:
+            groups[root].add(i)
+    return [sorted(members) for members in groups.values()]
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    """Hash every image in the input directory and report near-duplicate groups."""
+    args = create_parser().parse_args()
+    paths = find_images(args.input)
+    cache_path = None if args.no_cache else os.path.join(args.input, CACHE_FILE)
+
+    if not args.json:
+        print(f"🔍 Hashing {len(paths)} image(s) with {args.workers} worker(s)...")
+    started = time.perf_counter()
+    paths, hashes, pixels, hashed = hash_images(paths, args.workers, cache_path)
+    hashed_at = time.perf_counter()
+    pairs = near_duplicate_pairs(hashes, args.threshold)
+    groups = group_duplicates(len(paths), pairs)
+    finished = time.perf_counter()
+
+    # Keep the copy with the most pixels, then the biggest file
+    report = []
+    for members in groups:
+        members.sort(key=lambda i: (pixels[i], os.path.getsize(paths[i])), reverse=True)
+        report.append({'keep': paths[members[0]], 'duplicates': [paths[i] for i in members[1:]]})
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for group in report:
+            print(f"\n  🖼️  {os.path.basename(group['keep'])}")
+            for duplicate in group['duplicates']:
+                print(f"     ↳ {os.path.basename(duplicate)}")
+        print(f"\n📊 {len(paths)} images ({hashed} hashed, {len(paths) - hashed} cached) in "
+              f"{hashed_at - started:.2f}s, search {(finished - hashed_at) * 1000:.0f}ms")
+        print(f"♻️  {len(report)} group(s), {sum(len(g['duplicates']) for g in report)} duplicate(s)")
+
+    if args.move:
+        os.makedirs(args.move, exist_ok=True)
+        for group in report:
+            for duplicate in group['duplicates']:
+                shutil.move(duplicate, os.path.join(args.move, os.path.basename(duplicate)))
+        if not args.json:
+            print(f"📦 Moved duplicates to {args.move}")
+
+if __name__ == "__main__":
+    main()
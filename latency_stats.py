@@ -0,0 +1,248 @@
+import random
+import re
+import time
+from urllib.parse import urlsplit
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+SUB_BUCKET_BITS = 8  # 128 buckets per power of two: any percentile is within 0.8% of the true value
+MAX_SERIES = 200  # (path, status class) pairs tracked separately; the rest share one "(other)" row
+SUMMARY_ROWS = 15
+
+# Path segments that are IDs rather than routes, collapsed so each route is one series
+ID_SEGMENTS = [
+    (re.compile(r'^t[1-6]_[a-z0-9]+$'), ':fullname'),
+    (re.compile(r'^\d+$'), ':n'),
+    (re.compile(r'^[0-9a-f]{8,}$|^[0-9a-f-]{36}$'), ':hash'),
+]
+
+# ============================================================================
+# SKETCHES
+# ============================================================================
+
+class LatencyHistogram:
+    """
+    HDR-style log-linear histogram of durations in milliseconds.
+
+    Values below 256 get exact buckets; above that each power of two is split
+    into 128 buckets, so memory depends only on the largest value seen (a few
+    thousand counters at most) and histograms merge by adding counts.
+    """
+
+    def __init__(self):
+        self.counts = {}
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    @staticmethod
+    def bucket_index(value):
+        if value < (1 << SUB_BUCKET_BITS):
+            return value
+        shift = value.bit_length() - SUB_BUCKET_BITS
+        return (shift << (SUB_BUCKET_BITS - 1)) + (value >> shift)
+
+    @staticmethod
+    def bucket_range(index):
+        """Lowest and highest value that fall into bucket index."""
+        if index < (1 << SUB_BUCKET_BITS):
+            return index, index
+        shift = (index >> (SUB_BUCKET_BITS - 1)) - 1
+        low = (index - (shift << (SUB_BUCKET_BITS - 1))) << shift
+        return low, low + (1 << shift) - 1
+
+    def record(self, value):
+        value = max(0, int(round(value)))
+        index = self.bucket_index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.total += 1
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other):
+        """Add other's counts into this histogram."""
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        if other.total:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        self.total += other.total
+
+    def percentile(self, q):
+        """Value at percentile q (0-100), or None if nothing was recorded."""
+        if not self.total:
+            return None
+        rank = max(1, int(round(q / 100 * self.total)))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                low, high = self.bucket_range(index)
+                return min(max((low + high) // 2, self.min), self.max)
+        return self.max
+
+class Reservoir:
+    """Uniform random sample of at most size items from a stream of unknown length (Algorithm R)."""
+
+    def __init__(self, size, rng=None):
+        self.size = size
+        self.items = []
+        self.seen = 0
+        self.rng = rng or random.Random()
+
+    def add(self, item):
+        self.seen += 1
+        if len(self.items) < self.size:
+            self.items.append(item)
+            return
+        slot = self.rng.randrange(self.seen)
+        if slot < self.size:
+            self.items[slot] = item
+
+# ============================================================================
+# PER-ROUTE STATS
+# ============================================================================
+
+def route_key(url):
+    """Collapse IDs in the URL path so requests to the same route share a series."""
+    segments = urlsplit(url or '').path.split('/')
+    for i, segment in enumerate(segments):
+        for pattern, placeholder in ID_SEGMENTS:
+            if pattern.match(segment):
+                segments[i] = placeholder
+                break
+    return '/'.join(segments) or '/'
+
+def status_class(response):
+    status = response.get('status')
+    if response.get('error') or not isinstance(status, int):
+        return 'err'
+    return f"{status // 100}xx"
+
+class LatencyStats:
+    """Latency histograms per (route, status class), bounded to MAX_SERIES series."""
+
+    def __init__(self, max_series=MAX_SERIES):
+        self.max_series = max_series
+        self.series = {}
+        self.started = time.monotonic()
+
+    def record(self, req_resp):
+        request = req_resp.get('request', {})
+        response = req_resp.get('response', {})
+        key = (route_key(request.get('url')), status_class(response))
+        if key not in self.series and len(self.series) >= self.max_series:
+            key = ('(other)', key[1])
+
+        histogram = self.series.get(key)
+        if histogram is None:
+            histogram = self.series[key] = LatencyHistogram()
+        histogram.record(response.get('duration') or 0)
+
+    def merge(self, other):
+        for key, histogram in other.series.items():
+            self.series.setdefault(key, LatencyHistogram()).merge(histogram)
+
+    def render(self, rows=SUMMARY_ROWS, title="LATENCY SUMMARY"):
+        """Top-style table of the busiest series."""
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        total = sum(h.total for h in self.series.values())
+        busiest = sorted(self.series.items(), key=lambda item: item[1].total, reverse=True)[:rows]
+
+        lines = [
+            "",
+            f"📈 {title} — {total} requests in {elapsed:.0f}s ({total / elapsed:.1f}/s), {len(self.series)} series",
+            f"{'count':>7} {'req/s':>6} {'p50':>7} {'p95':>7} {'p99':>7} {'max':>7}  {'class':<4} route",
+        ]
+        for (route, cls), h in busiest:
+            p50, p95, p99 = (h.percentile(q) for q in (50, 95, 99))
+            lines.append(f"{h.total:>7} {h.total / elapsed:>6.2f} {p50:>5}ms {p95:>5}ms {p99:>5}ms {h.max:>5}ms  {cls:<4} {route}")
+        if len(self.series) > rows:
+            lines.append(f"   ... {len(self.series) - rows} more series")
+        return "\n".join(lines)
+
+# ============================================================================
+# PAGE LOADS
+# ============================================================================
+
+# Reddit page paths collapsed to the page type they render
+PAGE_PATTERNS = [
+    (re.compile(r'^/r/[^/]+/comments/[^/]+(?:/[^/]+)?'), '/r/:sub/comments/:post'),
+    (re.compile(r'^/(?:user|u)/[^/]+/m/[^/]+'), '/user/:user/m/:feed'),
+    (re.compile(r'^/(?:user|u)/[^/]+'), '/user/:user'),
+    (re.compile(r'^/r/[^/]+'), '/r/:sub'),
+]
+
+# (navigation field, column heading); times are ms since navigation start
+PAGE_METRICS = [
+    ('ttfb', 'TTFB'),
+    ('dcl', 'DCL'),
+    ('load', 'load'),
+    ('fcp', 'FCP'),
+    ('lcp', 'LCP'),
+    ('long_task_ms', 'long tasks'),
+    ('transfer_kb', 'KB'),
+]
+
+def page_route(url):
+    """URL pattern of a page: route_key plus subreddit, user, feed and post names collapsed."""
+    path = route_key(url)
+    for pattern, replacement in PAGE_PATTERNS:
+        path, replaced = pattern.subn(replacement, path, count=1)
+        if replaced:
+            break
+    return path.rstrip('/') or '/'
+
+class PageLoadStats:
+    """Histograms of each PAGE_METRICS value per page route, bounded to max_series routes."""
+
+    def __init__(self, max_series=MAX_SERIES):
+        self.max_series = max_series
+        self.routes = {}  # route -> (navigation count, {metric: LatencyHistogram})
+
+    def record(self, navigation):
+        route = page_route(navigation.get('url'))
+        if route not in self.routes and len(self.routes) >= self.max_series:
+            route = '(other)'
+
+        count, histograms = self.routes.get(route, (0, {}))
+        values = dict(navigation)
+        if navigation.get('transfer_bytes') is not None:
+            values['transfer_kb'] = navigation['transfer_bytes'] / 1024
+        for metric, _ in PAGE_METRICS:
+            # Metrics the browser does not report (e.g. long tasks in Firefox) stay None
+            if values.get(metric) is not None:
+                histograms.setdefault(metric, LatencyHistogram()).record(values[metric])
+        self.routes[route] = (count + 1, histograms)
+
+    def as_dict(self):
+        """{route: {'count': n, metric: {'p50', 'p95', 'max', 'samples'}}} for saving."""
+        result = {}
+        for route, (count, histograms) in self.routes.items():
+            result[route] = {'count': count}
+            for metric, h in histograms.items():
+                result[route][metric] = {'p50': h.percentile(50), 'p95': h.percentile(95), 'max': h.max,
+                                         'samples': h.total}
+        return result
+
+    def render(self, rows=SUMMARY_ROWS, title="PAGE LOADS"):
+        """Table of p50/p95 per metric for the most visited routes."""
+        total = sum(count for count, _ in self.routes.values())
+        busiest = sorted(self.routes.items(), key=lambda item: item[1][0], reverse=True)[:rows]
+
+        lines = [
+            "",
+            f"📄 {title} — {total} navigations, {len(self.routes)} routes (p50/p95, ms unless noted)",
+            f"{'count':>5} " + " ".join(f"{label:>11}" for _, label in PAGE_METRICS) + "  route",
+        ]
+        for route, (count, histograms) in busiest:
+            cells = []
+            for metric, _ in PAGE_METRICS:
+                h = histograms.get(metric)
+                cells.append(f"{h.percentile(50)}/{h.percentile(95)}" if h else "-")
+            lines.append(f"{count:>5} " + " ".join(f"{cell:>11}" for cell in cells) + f"  {route}")
+        if len(self.routes) > rows:
+            lines.append(f"   ... {len(self.routes) - rows} more routes")
+        return "\n".join(lines)
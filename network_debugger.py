@@ -1,10 +1,14 @@
-from selenium import webdriver
-from selenium.webdriver.firefox.options import Options
-from selenium.common.exceptions import WebDriverException, InvalidSessionIdException
 import time
 import json
+import hashlib
 import argparse
 import sys
+import queue
+import threading
+import collections
+from urllib.parse import urlsplit
+
+# Selenium is imported only once a browser is needed, so --list-presets starts instantly
 
 # ============================================================================
 # CONFIGURATION PRESETS
@@ -101,6 +105,16 @@ EXAMPLES:
   # Auto-save to file
   python network_debugger.py --save requests.json
 
+  # Record into an indexed SQLite database, then query it
+  python network_debugger.py --db captures.db
+  python network_debugger.py query --db captures.db --status 4xx --operation CustomFeedAddSubreddits --since 1h
+
+  # All-day session: print 1% of requests, keep 500 sampled entries and live latency percentiles
+  python network_debugger.py --preset all --sample-rate 0.01 --reservoir 500 --save sample.json
+
+  # Per-page load timings (TTFB, DCL, load, FCP, LCP, long tasks, bytes) aggregated per URL pattern
+  python network_debugger.py --page-perf --page-perf-save page-loads.json
+
   # Quiet mode (less verbose output)
   python network_debugger.py --quiet
 
@@ -128,6 +142,10 @@ KEYBOARD SHORTCUTS:
 
     parser.add_argument('--profile', default=PROFILE_PATH, help=f'Firefox profile path (default: {PROFILE_PATH})')
 
+    parser.add_argument('--full-profile',
+                        action='store_true',
+                        help='Launch with a full copy of the profile (extensions, history) instead of the slim snapshot')
+
     # Custom configuration options
     parser.add_argument('--methods',
                         '-m',
@@ -150,6 +168,21 @@ KEYBOARD SHORTCUTS:
     # Output options
     parser.add_argument('--save', metavar='FILENAME', help='Save captured requests to file on exit (no prompt)')
 
+    parser.add_argument('--db', metavar='FILE', help='Also write every capture into an indexed SQLite database')
+
+    parser.add_argument('--cprofile',
+                        action='store_true',
+                        help='Run under cProfile; reports go next to --save/--db output')
+
+    parser.add_argument('--trace-memory',
+                        action='store_true',
+                        help='Run under tracemalloc, sampling every --memory-sample-every polls')
+
+    parser.add_argument('--memory-sample-every',
+                        type=int,
+                        default=20,
+                        help='Poll iterations between memory samples (default: 20)')
+
     parser.add_argument('--quiet',
                         '-q',
                         action='store_true',
@@ -162,6 +195,41 @@ KEYBOARD SHORTCUTS:
                         default=0.5,
                         help='How often to check for new requests (seconds, default: 0.5)')
 
+    parser.add_argument('--writer-queue',
+                        type=int,
+                        default=1000,
+                        help='Entries buffered for the output writer before falling back to minimal lines (default: 1000)')
+
+    parser.add_argument('--writer-batch',
+                        type=int,
+                        default=50,
+                        help='Maximum entries formatted and flushed per write (default: 50)')
+
+    parser.add_argument('--sample-rate',
+                        type=float,
+                        metavar='RATE',
+                        help='Sampling mode: print only this fraction of requests (e.g. 0.01) and keep '
+                        'per-route latency histograms instead of every entry')
+
+    parser.add_argument('--reservoir',
+                        type=int,
+                        default=500,
+                        help='Sampling mode: full entries kept (uniformly sampled) for --save (default: 500)')
+
+    parser.add_argument('--summary-every',
+                        type=float,
+                        default=10.0,
+                        help='Sampling mode: seconds between live latency summaries (default: 10)')
+
+    parser.add_argument('--page-perf',
+                        action='store_true',
+                        help='Record navigation timing, first paint, LCP, long tasks and transferred bytes '
+                        'for every page load, summarised per URL pattern')
+
+    parser.add_argument('--page-perf-save',
+                        metavar='FILE',
+                        help='With --page-perf: write every navigation and the per-pattern percentiles to FILE')
+
     # List presets
     parser.add_argument('--list-presets', action='store_true', help='List all available presets and exit')
 
@@ -216,7 +284,16 @@ def build_config_from_args(args):
     config['quiet'] = args.quiet
     config['minimal'] = args.minimal
     config['save_file'] = args.save
+    config['db_file'] = args.db
+    config['memory_sample_every'] = args.memory_sample_every
     config['check_interval'] = args.check_interval
+    config['writer_queue_size'] = args.writer_queue
+    config['writer_batch_size'] = args.writer_batch
+    config['sample_rate'] = args.sample_rate
+    config['reservoir_size'] = args.reservoir
+    config['summary_every'] = args.summary_every
+    config['page_perf'] = args.page_perf or bool(args.page_perf_save)
+    config['page_perf_file'] = args.page_perf_save
 
     return config
 
@@ -224,15 +301,29 @@ def build_config_from_args(args):
 # SELENIUM DRIVER SETUP
 # ============================================================================
 
-def initialize_driver(profile_path):
-    """Initialize and return a Firefox WebDriver with the specified profile."""
+def initialize_driver(profile_path, full_profile=False):
+    """
+    Initialize and return a Firefox WebDriver with the specified profile.
+    Each launch runs on its own copy of a slim snapshot of the profile. With
+    full_profile, the real profile is handed to Selenium instead, which copies
+    all of it to a temporary directory (slow, but nothing is left out).
+    """
+    from selenium import webdriver
+    from selenium.webdriver.firefox.options import Options
+    from profile_manager import use_profile_snapshot
+
     options = Options()
-    options.profile = profile_path
+    if full_profile:
+        options.profile = profile_path
+    else:
+        use_profile_snapshot(options, profile_path)
     driver = webdriver.Firefox(options=options)
     return driver
 
 def is_driver_alive(driver):
     """Check if the WebDriver session is still active."""
+    from selenium.common.exceptions import WebDriverException, InvalidSessionIdException
+
     try:
         # Try to get the current URL - this will fail if browser is closed
         _ = driver.current_url
@@ -380,26 +471,240 @@ def install_enhanced_monitor(driver, config):
 
     driver.execute_script(monitor_script)
 
-def save_captured_data(captured, filename):
-    """Save captured data to file."""
+# ============================================================================
+# PAGE PERFORMANCE
+# ============================================================================
+
+# Runs on every poll. The first run in a document installs PerformanceObservers
+# (buffered, so entries from before the install are included) keyed by
+# performance.timeOrigin; every run returns the document's metrics so far.
+PAGE_PERF_SCRIPT = """
+    let state = window.__pagePerf;
+    if (!state || state.timeOrigin !== performance.timeOrigin) {
+        state = window.__pagePerf = {
+            timeOrigin: performance.timeOrigin, lcp: null, longTasks: null, longTaskMs: null,
+            bytes: 0, sized: false, resources: 0, blocking: 0,
+        };
+        const supported = PerformanceObserver.supportedEntryTypes || [];
+        const observe = (type, onEntry) => {
+            if (!supported.includes(type)) return false;
+            new PerformanceObserver(list => list.getEntries().forEach(onEntry)).observe({type, buffered: true});
+            return true;
+        };
+        observe('largest-contentful-paint', e => { state.lcp = Math.max(state.lcp || 0, e.startTime); });
+        if (observe('longtask', e => { state.longTasks++; state.longTaskMs += e.duration; })) {
+            state.longTasks = 0;
+            state.longTaskMs = 0;
+        }
+        observe('resource', e => {
+            state.sized = state.sized || e.transferSize !== undefined;
+            state.bytes += e.transferSize || 0;
+            state.resources++;
+            if (e.renderBlockingStatus === 'blocking') state.blocking++;
+        });
+    }
+
+    const nav = performance.getEntriesByType('navigation')[0];
+    const paint = {};
+    performance.getEntriesByType('paint').forEach(e => { paint[e.name] = e.startTime; });
+    const positive = value => value > 0 ? value : null;
+    const sized = state.sized || (nav !== undefined && nav.transferSize !== undefined);
+    return {
+        time_origin: state.timeOrigin,
+        url: nav ? nav.name : location.href,
+        ttfb: nav ? positive(nav.responseStart) : null,
+        dcl: nav ? positive(nav.domContentLoadedEventEnd) : null,
+        load: nav ? positive(nav.loadEventEnd) : null,
+        fp: positive(paint['first-paint']),
+        fcp: positive(paint['first-contentful-paint']),
+        lcp: state.lcp,
+        long_tasks: state.longTasks,
+        long_task_ms: state.longTaskMs,
+        transfer_bytes: sized ? state.bytes + (nav ? nav.transferSize || 0 : 0) : null,
+        resources: state.resources,
+        blocking_resources: state.blocking,
+    };
+"""
+
+class PagePerfMonitor:
+    """
+    Follow the top-level document across navigations. Each poll refreshes the
+    current document's metrics; when a new timeOrigin shows up, the previous
+    document's last snapshot is its finished page load.
+    """
+
+    def __init__(self):
+        from latency_stats import PageLoadStats
+        self.stats = PageLoadStats()
+        self.navigations = []
+        self.current = None
+
+    def poll(self, driver):
+        """Returns (finished page load or None, True if a new document was loaded since the last poll)."""
+        from selenium.common.exceptions import JavascriptException
+
+        try:
+            snapshot = driver.execute_script(PAGE_PERF_SCRIPT)
+        except JavascriptException:
+            return None, False  # Document is being replaced; try again next poll
+        if not snapshot:
+            return None, False
+
+        new_document = self.current is not None and snapshot['time_origin'] != self.current['time_origin']
+        finished = self.finish() if new_document else None
+        self.current = snapshot
+        return finished, new_document
+
+    def finish(self):
+        """
+        Record the current document as a finished page load and return it.
+        about:blank and other non-web documents are dropped (returns None).
+        """
+        navigation, self.current = self.current, None
+        if navigation and urlsplit(navigation.get('url') or '').scheme not in ('http', 'https'):
+            return None
+        if navigation:
+            self.navigations.append(navigation)
+            self.stats.record(navigation)
+        return navigation
+
+    def save(self, filename):
+        with open(filename, 'w') as f:
+            json.dump({'navigations': self.navigations, 'routes': self.stats.as_dict()}, f, indent=2)
+        print(f"💾 Saved {len(self.navigations)} page loads to {filename}")
+
+# ============================================================================
+# BODY STORE
+# ============================================================================
+
+CAS_FORMAT = 'cas-v1'
+CAS_MIN_BODY = 64  # Bodies shorter than a digest reference are kept inline
+
+def body_digest(body):
+    """Content digest of a body (strings as-is, JSON canonicalised)."""
+    if isinstance(body, str):
+        data = body.encode()
+    else:
+        data = json.dumps(body, sort_keys=True, separators=(',', ':')).encode()
+    return hashlib.blake2b(data, digest_size=16).hexdigest(), len(data)
+
+class BodyStore:
+    """
+    Content-addressed store for request/response bodies. Identical bodies are
+    kept once; interned entries carry 'body_digest' instead of 'body'.
+    """
+
+    def __init__(self, bodies=None):
+        self.bodies = bodies if bodies is not None else {}
+
+    def _intern_part(self, part):
+        if not isinstance(part, dict) or part.get('body') is None:
+            return part
+        digest, size = body_digest(part['body'])
+        if size < CAS_MIN_BODY:
+            return part
+        self.bodies.setdefault(digest, part['body'])
+        part = dict(part)
+        del part['body']
+        part['body_digest'] = digest
+        return part
+
+    def intern(self, req_resp):
+        """Return a copy of req_resp whose bodies are stored here; the original is left untouched."""
+        return {**req_resp,
+                'request': self._intern_part(req_resp.get('request')),
+                'response': self._intern_part(req_resp.get('response'))}
+
+    def _resolve_part(self, part):
+        if not isinstance(part, dict) or 'body_digest' not in part:
+            return part
+        part = dict(part)
+        part['body'] = self.bodies.get(part.pop('body_digest'))
+        return part
+
+    def resolve(self, req_resp):
+        """Return a copy of req_resp with its bodies inlined again."""
+        return {**req_resp,
+                'request': self._resolve_part(req_resp.get('request')),
+                'response': self._resolve_part(req_resp.get('response'))}
+
+def save_captured_data(captured, filename, body_store=None):
+    """Save captured data to file, each distinct body written once."""
     try:
+        body_store = body_store or BodyStore()
+        entries = [body_store.intern(req_resp) for req_resp in captured]
+        used = {part['body_digest'] for req_resp in entries
+                for part in (req_resp.get('request'), req_resp.get('response'))
+                if isinstance(part, dict) and 'body_digest' in part}
+        data = {
+            'format': CAS_FORMAT,
+            'bodies': {digest: body_store.bodies[digest] for digest in sorted(used)},
+            'captures': entries,
+        }
         with open(filename, 'w') as f:
-            json.dump(captured, f, indent=2)
-        print(f"💾 Saved to {filename}")
+            json.dump(data, f, indent=2)
+        print(f"💾 Saved to {filename} ({len(entries)} captures, {len(used)} distinct bodies)")
         return True
     except Exception as e:
         print(f"❌ Failed to save file: {e}")
         return False
 
+def load_captured_data(filename):
+    """
+    Load request/response pairs written by save_captured_data, with bodies
+    inlined. Older saves (a plain list of pairs) are returned as they are.
+    """
+    with open(filename) as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        return data
+    if data.get('format') != CAS_FORMAT:
+        raise ValueError(f"{filename}: unknown capture format {data.get('format')!r}")
+    body_store = BodyStore(data['bodies'])
+    return [body_store.resolve(req_resp) for req_resp in data['captures']]
+
+def poll_captured_requests(driver):
+    """Drain and return the request/response pairs captured since the last poll."""
+    return driver.execute_script("""
+        const buffer = window.capturedRequests || [];
+        return buffer.splice(0, buffer.length);
+    """) or []
+
 def stream_network_activity(driver, config):
     """
     Continuously stream network activity to console.
+
+    Polling only drains the page buffer and hands entries to an OutputWriter;
+    all formatting and terminal I/O happens on the writer thread.
+
+    In sampling mode (config['sample_rate']) only a fraction of entries is
+    printed, a fixed-size reservoir replaces the full capture list and every
+    entry feeds per-route latency histograms, so memory stays bounded.
     """
-    last_count = 0
+    from selenium.common.exceptions import WebDriverException, InvalidSessionIdException
+
+    from run_profiler import mark_phase
+
     request_number = 0
+    poll_count = 0
+    memory_sample_every = max(1, config.get('memory_sample_every', 20))
     check_interval = config.get('check_interval', 0.5)
     captured = []
+    body_store = BodyStore()
     browser_closed = False
+    interrupted = False
+
+    sample_rate = config.get('sample_rate')
+    reservoir = stats = None
+    if sample_rate is not None:
+        import random
+        from latency_stats import LatencyStats, Reservoir
+        reservoir = Reservoir(config.get('reservoir_size', 500))
+        stats = LatencyStats()
+        summary_every = config.get('summary_every', 10.0)
+        next_summary = time.monotonic() + summary_every
+
+    page_perf = PagePerfMonitor() if config.get('page_perf') else None
 
     print("\n" + "=" * 50)
     print("🌊 STREAMING NETWORK ACTIVITY")
@@ -413,64 +718,269 @@ def stream_network_activity(driver, config):
         print("Mode: Minimal (numbers and URLs only)")
     if config.get('save_file'):
         print(f"Will save to: {config['save_file']}")
+    if config.get('db_file'):
+        print(f"Recording to database: {config['db_file']}")
+    if sample_rate is not None:
+        print(f"Sampling: printing {sample_rate:.1%}, keeping {reservoir.size} entries, summary every {summary_every:g}s")
+    if page_perf:
+        print("Page performance: recording every navigation")
     print("Press Ctrl+Q or Ctrl+C to stop (or just close the browser)\n")
 
+    writer = OutputWriter(config,
+                          max_queue=config.get('writer_queue_size', 1000),
+                          batch_size=config.get('writer_batch_size', 50))
+    writer.start()
+
+    store = None
+    if config.get('db_file'):
+        from capture_store import CaptureStore
+        store = CaptureStore(config['db_file'])
+
     try:
         while True:
             # Check if browser is still alive
             if not is_driver_alive(driver):
-                print("\n🚪 Browser closed by user")
                 browser_closed = True
                 break
 
             try:
-                # Get captured requests
-                captured = driver.execute_script("return window.capturedRequests || [];")
-
-                # Print new requests
-                if len(captured) > last_count:
-                    for req_resp in captured[last_count:]:
-                        # Filter for errors if preset is 'errors'
-                        if config.get('only_errors'):
-                            response = req_resp.get('response', {})
-                            status = response.get('status', 0)
-                            has_error = response.get('error') or (status >= 400)
-                            if not has_error:
-                                continue
-
-                        request_number += 1
-
-                        if config.get('minimal'):
-                            print_minimal_request(req_resp, request_number)
-                        elif config.get('quiet'):
-                            print_quiet_request(req_resp, request_number, config)
-                        else:
-                            print_enhanced_request_response(req_resp, request_number, config)
-
-                    last_count = len(captured)
+                # Drain newly captured requests
+                new_entries = poll_captured_requests(driver)
+                if reservoir is None:
+                    captured.extend(body_store.intern(req_resp) for req_resp in new_entries)
+                else:
+                    for req_resp in new_entries:
+                        reservoir.add(req_resp)
+                        stats.record(req_resp)
+
+                if store:
+                    for req_resp in new_entries:
+                        store.add(req_resp)
+                    store.flush()
+
+                for req_resp in new_entries:
+                    # Filter for errors if preset is 'errors'
+                    if config.get('only_errors'):
+                        response = req_resp.get('response', {})
+                        status = response.get('status', 0)
+                        has_error = response.get('error') or (status >= 400)
+                        if not has_error:
+                            continue
+
+                    request_number += 1
+                    if sample_rate is None or random.random() < sample_rate:
+                        writer.submit(req_resp, request_number)
+
+                if page_perf:
+                    finished, new_document = page_perf.poll(driver)
+                    if new_document:
+                        # Navigation replaced window, and the fetch hook with it
+                        install_enhanced_monitor(driver, config)
+                    if finished:
+                        writer.note(format_page_load(finished))
+
+                if stats and time.monotonic() >= next_summary:
+                    writer.show_summary(stats.render())
+                    next_summary = time.monotonic() + summary_every
+
+                poll_count += 1
+                if poll_count % memory_sample_every == 0:
+                    kept = len(captured) if reservoir is None else len(reservoir.items)
+                    mark_phase(f"poll {poll_count} ({kept} kept)")
 
             except (WebDriverException, InvalidSessionIdException):
                 # Browser was closed
-                print("\n🚪 Browser closed by user")
                 browser_closed = True
                 break
 
             time.sleep(check_interval)
 
     except KeyboardInterrupt:
+        interrupted = True
+
+    try:
+        writer.close()
+    except Exception as e:
+        print(f"\n⚠️  Output writer failed ({writer.errors} error(s)), some entries were not shown: {e!r}")
+    if interrupted:
         print("\n\n⏹️  Stopped by user (Ctrl+C)")
+    if store:
+        store.close()
+    if browser_closed:
+        print("\n🚪 Browser closed by user")
+    if stats:
+        print(stats.render(title="FINAL LATENCY SUMMARY"))
+        captured = reservoir.items
+    if page_perf:
+        page_perf.finish()
+        print(page_perf.stats.render())
 
     # Print summary
     print("\n" + "=" * 50)
     print(f"📊 SUMMARY: Captured {request_number} request/response pairs")
+    if writer.degraded:
+        print(f"⚠️  {writer.degraded} shown in minimal form because output fell behind")
+    if writer.dropped:
+        print(f"⚠️  {writer.dropped} not shown at all (overflow buffer full)")
+    if reservoir:
+        print(f"🎲 Kept a uniform sample of {len(captured)} of {reservoir.seen} captured entries")
+    if body_store.bodies:
+        print(f"🗜️  {len(body_store.bodies)} distinct bodies held in memory")
     print("=" * 50)
 
+    if page_perf and config.get('page_perf_file'):
+        page_perf.save(config['page_perf_file'])
+
     # Save if --save was specified and we have data
     if config.get('save_file') and len(captured) > 0:
-        save_captured_data(captured, config['save_file'])
+        save_captured_data(captured, config['save_file'], body_store)
+
+# ============================================================================
+# OUTPUT WRITER
+# ============================================================================
+
+class OutputWriter:
+    """
+    Format and print captured requests on a background thread.
+
+    The poll loop calls submit(), which never blocks: entries go onto a bounded
+    queue, and when that queue is full they are rendered as cheap minimal lines
+    into an overflow buffer instead. The writer thread drains both in batches
+    and writes each batch with a single flush.
+
+    Errors on the writer thread (an entry that cannot be formatted, a failed
+    write) never stop it: the first is reported on stderr, the rest are
+    counted, and close() re-raises the first on the calling thread.
+    """
+
+    def __init__(self, config, max_queue=1000, batch_size=50, stream=None):
+        self.config = config
+        self.batch_size = batch_size
+        self.stream = stream or sys.stdout
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.overflow = collections.deque(maxlen=max_queue)
+        self.degraded = 0
+        self.dropped = 0
+        self.summary = None
+        self.notes = collections.deque()
+        self.error = None
+        self.errors = 0
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='output-writer', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def submit(self, req_resp, request_number):
+        """Queue an entry for rendering; degrade to a minimal line if the queue is full."""
+        try:
+            self.queue.put_nowait((request_number, req_resp))
+        except queue.Full:
+            if len(self.overflow) == self.overflow.maxlen:
+                self.dropped += 1
+            self.degraded += 1
+            self.overflow.append((request_number, format_minimal_request(req_resp, request_number)))
+
+    def show_summary(self, text):
+        """Print text after the next batch; only the latest summary is kept if output falls behind."""
+        self.summary = text
+
+    def note(self, text):
+        """Print text after the next batch; unlike summaries, every note is printed."""
+        self.notes.append(text)
+
+    def close(self, timeout=10):
+        """Flush everything still queued and stop the writer thread. Re-raises the first writer error."""
+        self._stopping.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+        error, self.error = self.error, None
+        if error is not None:
+            raise error
+
+    def _report(self, error):
+        self.errors += 1
+        if self.error is None:
+            self.error = error
+            print(f"⚠️  Output writer error (further ones are only counted): {error!r}", file=sys.stderr)
+
+    def _render(self, req_resp, number):
+        try:
+            return format_request(req_resp, number, self.config)
+        except Exception as e:
+            self._report(e)
+            return format_minimal_request(req_resp, number)
+
+    def _next_batch(self):
+        batch = []
+        try:
+            batch.append(self.queue.get(timeout=0.1))
+        except queue.Empty:
+            pass
+        while batch and len(batch) < self.batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
 
-def print_minimal_request(req_resp, request_number):
-    """Print minimal request info - just number and URL."""
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            rendered = [(number, self._render(req_resp, number)) for number, req_resp in batch]
+            while self.overflow:
+                rendered.append(self.overflow.popleft())
+            notes = []
+            while self.notes:
+                notes.append(self.notes.popleft())
+            summary, self.summary = self.summary, None
+
+            if not rendered and not notes and summary is None:
+                if self._stopping.is_set() and self.queue.empty():
+                    break
+                continue
+
+            rendered.sort(key=lambda item: item[0])
+            try:
+                text = "\n".join([text for _, text in rendered] + notes)
+                if summary is not None:
+                    text = f"{text}\n{summary}" if text else summary
+                self.stream.write(text + "\n")
+                self.stream.flush()
+            except Exception as e:
+                # Disk full, terminal gone...; keep draining so the poll loop never blocks
+                self._report(e)
+
+# ============================================================================
+# FORMATTING
+# ============================================================================
+
+def format_request(req_resp, request_number, config):
+    """Render a request/response pair according to the output mode in config."""
+    if config.get('minimal'):
+        return format_minimal_request(req_resp, request_number)
+    elif config.get('quiet'):
+        return format_quiet_request(req_resp, request_number, config)
+    return format_enhanced_request_response(req_resp, request_number, config)
+
+def format_page_load(navigation):
+    """One line per finished page load."""
+    from latency_stats import page_route
+
+    def ms(key):
+        value = navigation.get(key)
+        return "-" if value is None else f"{value:.0f}ms"
+
+    transferred = "? KB" if navigation.get('transfer_bytes') is None else f"{navigation['transfer_bytes'] / 1024:.0f}KB"
+    long_tasks = "n/a" if navigation.get('long_tasks') is None else \
+        f"{navigation['long_tasks']} ({navigation['long_task_ms']:.0f}ms)"
+    return (f"📄 {page_route(navigation.get('url'))}  TTFB {ms('ttfb')}  DCL {ms('dcl')}  load {ms('load')}  "
+            f"FCP {ms('fcp')}  LCP {ms('lcp')}  long tasks {long_tasks}  "
+            f"{transferred} in {navigation.get('resources', 0)} resources  "
+            f"{navigation.get('url')}")
+
+def format_minimal_request(req_resp, request_number):
+    """Format minimal request info - just number and URL."""
     request = req_resp.get('request', {})
     response = req_resp.get('response', {})
 
@@ -490,14 +1000,11 @@ def print_minimal_request(req_resp, request_number):
     else:
         icon = "❓"
 
-    print(f"{icon} #{request_number} {method} {status} ({duration}ms) {url}")
-
-def print_quiet_request(req_resp, request_number, config):
-    """Print request without bodies - only headers and metadata."""
-    request = req_resp.get('request', {})
-    response = req_resp.get('response', {})
+    return f"{icon} #{request_number} {method} {status} ({duration}ms) {url}"
 
-    # Extract info
+def format_request_header(request, response, request_number):
+    """Format the boxed header shared by the quiet and enhanced views."""
+    # Extract short URL
     full_url = request.get('url', 'N/A')
     short_url = full_url.split('/')[-1] if '/' in full_url else full_url
     if len(short_url) > 30:
@@ -508,84 +1015,80 @@ def print_quiet_request(req_resp, request_number, config):
         timestamp = timestamp.split('T')[1].split('.')[0] if 'T' in timestamp else timestamp
 
     method = request.get('method', 'N/A')
-    status = response.get('status', 'N/A')
     duration = response.get('duration', 0)
     duration_str = f"{duration}ms" if duration else "N/A"
 
-    # Header
-    print("\n" + "┌" + "─" * 48 + "┐")
-    print(f"│ REQUEST #{request_number} │ {timestamp} │ {method} │ {duration_str}")
-    print(f"│ {short_url}")
-    print("└" + "─" * 48 + "┘")
+    return [
+        "",
+        "┌" + "─" * 48 + "┐",
+        f"│ REQUEST #{request_number} │ {timestamp} │ {method} │ {duration_str}",
+        f"│ {short_url}",
+        "└" + "─" * 48 + "┘",
+    ]
 
-    print(f"URL: {full_url}")
-    print(f"Status: {status}")
-    print("─" * 50)
+def format_quiet_request(req_resp, request_number, config):
+    """Format request without bodies - only headers and metadata."""
+    request = req_resp.get('request', {})
+    response = req_resp.get('response', {})
 
-def print_enhanced_request_response(req_resp, request_number, config):
-    """Print a request/response pair with enhanced details."""
+    lines = format_request_header(request, response, request_number)
+    lines.append(f"URL: {request.get('url', 'N/A')}")
+    lines.append(f"Status: {response.get('status', 'N/A')}")
+    lines.append("─" * 50)
+    return "\n".join(lines)
+
+def format_headers(headers):
+    """Format a header mapping, truncating long values."""
+    lines = ["", "Headers:"]
+    for key, value in headers.items():
+        value_str = str(value)
+        if len(value_str) > 100:
+            value_str = value_str[:100] + "..."
+        lines.append(f"  {key}: {value_str}")
+    return lines
+
+def format_body(body, max_length):
+    """Format a request or response body, truncated to max_length characters."""
+    try:
+        body_str = json.dumps(body, indent=2)
+        if len(body_str) > max_length:
+            return body_str[:max_length] + "\n... (truncated)"
+        return body_str
+    except (TypeError, ValueError):
+        body_str = str(body)
+        if len(body_str) > max_length:
+            return body_str[:max_length] + "... (truncated)"
+        return body_str
+
+def format_enhanced_request_response(req_resp, request_number, config):
+    """Format a request/response pair with enhanced details."""
     request = req_resp.get('request', {})
     response = req_resp.get('response', {})
 
-    # Extract short URL
     full_url = request.get('url', 'N/A')
-    short_url = full_url.split('/')[-1] if '/' in full_url else full_url
-    if len(short_url) > 30:
-        short_url = short_url[:30] + '...'
-
-    timestamp = request.get('timestamp', 'N/A')
-    if timestamp != 'N/A':
-        timestamp = timestamp.split('T')[1].split('.')[0] if 'T' in timestamp else timestamp
-
     method = request.get('method', 'N/A')
-
-    # Duration
     duration = response.get('duration', 0)
     duration_str = f"{duration}ms" if duration else "N/A"
 
     # Header with request number, time, method, and URL
-    print("\n" + "┌" + "─" * 48 + "┐")
-    print(f"│ REQUEST #{request_number} │ {timestamp} │ {method} │ {duration_str}")
-    print(f"│ {short_url}")
-    print("└" + "─" * 48 + "┘")
+    lines = format_request_header(request, response, request_number)
 
     # REQUEST
-    print(f"\n📤 REQUEST")
-    print(f"URL: {full_url}")
-    print(f"Method: {method}")
+    lines += ["", "📤 REQUEST", f"URL: {full_url}", f"Method: {method}"]
 
     # Request headers
     if config['capture_headers'] and request.get('headers'):
-        print(f"\nHeaders:")
-        for key, value in request['headers'].items():
-            value_str = str(value)
-            if len(value_str) > 100:
-                value_str = value_str[:100] + "..."
-            print(f"  {key}: {value_str}")
+        lines += format_headers(request['headers'])
 
     # Request body
     if request.get('body'):
-        print(f"\nBody:")
-        try:
-            body_str = json.dumps(request['body'], indent=2)
-            if len(body_str) > config['max_body_length']:
-                print(body_str[:config['max_body_length']] + "\n... (truncated)")
-            else:
-                print(body_str)
-        except:
-            body_str = str(request['body'])
-            if len(body_str) > config['max_body_length']:
-                print(body_str[:config['max_body_length']] + "... (truncated)")
-            else:
-                print(body_str)
+        lines += ["", "Body:", format_body(request['body'], config['max_body_length'])]
 
     # RESPONSE
     if response:
         # Check for errors
         if response.get('error'):
-            print(f"\n❌ ERROR")
-            print(f"Error: {response['error']}")
-            print(f"Duration: {duration_str}")
+            lines += ["", "❌ ERROR", f"Error: {response['error']}", f"Duration: {duration_str}"]
         else:
             status = response.get('status', 'N/A')
             status_text = response.get('statusText', '')
@@ -600,37 +1103,18 @@ def print_enhanced_request_response(req_resp, request_number, config):
             else:
                 status_icon = "❌"
 
-            print(f"\n📥 RESPONSE {status_icon}")
-            print(f"Status: {status} {status_text}")
-            print(f"Duration: {duration_str}")
+            lines += ["", f"📥 RESPONSE {status_icon}", f"Status: {status} {status_text}", f"Duration: {duration_str}"]
 
             # Response headers
             if config['capture_headers'] and response.get('headers'):
-                print(f"\nHeaders:")
-                for key, value in response['headers'].items():
-                    value_str = str(value)
-                    if len(value_str) > 100:
-                        value_str = value_str[:100] + "..."
-                    print(f"  {key}: {value_str}")
+                lines += format_headers(response['headers'])
 
             # Response body
             if response.get('body'):
-                print(f"\nBody:")
-                try:
-                    body = response['body']
-                    body_str = json.dumps(body, indent=2)
-                    if len(body_str) > config['max_body_length']:
-                        print(body_str[:config['max_body_length']] + "\n... (truncated)")
-                    else:
-                        print(body_str)
-                except:
-                    body_str = str(response['body'])
-                    if len(body_str) > config['max_body_length']:
-                        print(body_str[:config['max_body_length']] + "... (truncated)")
-                    else:
-                        print(body_str)
-
-    print("\n" + "─" * 50)
+                lines += ["", "Body:", format_body(response['body'], config['max_body_length'])]
+
+    lines += ["", "─" * 50]
+    return "\n".join(lines)
 
 # ============================================================================
 # MAIN
@@ -638,6 +1122,16 @@ def print_enhanced_request_response(req_resp, request_number, config):
 
 def main():
     """Start streaming network monitor with command line arguments."""
+    # Subcommands that work on saved captures and never start a browser
+    if sys.argv[1:2] == ['query']:
+        from capture_store import query_main
+        query_main(sys.argv[2:])
+        return
+    if sys.argv[1:2] == ['serve']:
+        from fixture_server import serve_main
+        serve_main(sys.argv[2:])
+        return
+
     parser = create_parser()
     args = parser.parse_args()
 
@@ -649,11 +1143,13 @@ def main():
     # Build configuration
     config = build_config_from_args(args)
 
+    from selenium.common.exceptions import WebDriverException, InvalidSessionIdException
+
     print("\n🚀 Starting Network Stream Monitor...")
     print(f"Preset: {args.preset}")
     print(f"Profile: {args.profile}")
 
-    driver = initialize_driver(args.profile)
+    driver = initialize_driver(args.profile, args.full_profile)
 
     try:
         # Navigate to URL
@@ -666,7 +1162,13 @@ def main():
         print("✅ Monitor installed!\n")
 
         # Start streaming
-        stream_network_activity(driver, config)
+        if args.cprofile or args.trace_memory:
+            from run_profiler import RunProfiler, report_base
+            base = report_base(args.save or args.db, 'network-debugger')
+            with RunProfiler(base, args.cprofile, args.trace_memory):
+                stream_network_activity(driver, config)
+        else:
+            stream_network_activity(driver, config)
 
     except Exception as e:
         # Only show error if it's not a session/connection error
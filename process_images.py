@@ -0,0 +1,147 @@
+from PIL import Image
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import os
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+IMAGE_EXTENSIONS = {".jpeg", ".jpg", ".png", ".gif", ".webp"}
+DEFAULT_THUMB_SIZES = [256]
+DEFAULT_WEBP_QUALITY = 80
+
+# ============================================================================
+# COMMAND LINE ARGUMENT PARSER
+# ============================================================================
+
+def create_parser():
+    """Create and return the argument parser."""
+    parser = argparse.ArgumentParser(description='Create thumbnails and WebP copies of downloaded images')
+
+    parser.add_argument('input', nargs='?', default='.', help='Directory of downloaded images (default: current directory)')
+
+    parser.add_argument('--out', '-o', help='Output directory (default: <input>/processed)')
+
+    parser.add_argument('--thumb-sizes',
+                        type=int,
+                        nargs='+',
+                        default=DEFAULT_THUMB_SIZES,
+                        help='Bounding box sizes in pixels for thumbnails (default: 256)')
+
+    parser.add_argument('--webp', action='store_true', help='Also recompress the full image to WebP')
+
+    parser.add_argument('--quality',
+                        type=int,
+                        default=DEFAULT_WEBP_QUALITY,
+                        help=f'WebP quality target 1-100 (default: {DEFAULT_WEBP_QUALITY})')
+
+    parser.add_argument('--workers', '-w', type=int, default=os.cpu_count(), help='Worker processes (default: all cores)')
+
+    return parser
+
+# ============================================================================
+# PROCESSING
+# ============================================================================
+
+def find_images(directory):
+    """Return image files directly inside directory, sorted by name."""
+    images = []
+    for entry in os.scandir(directory):
+        if entry.is_file() and os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS:
+            images.append(entry.path)
+    return sorted(images)
+
+def output_paths(path, out_dir, thumb_sizes, webp):
+    """Map each output kind to the file it is written to."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    outputs = {f"thumb{size}": os.path.join(out_dir, f"{stem}.thumb{size}.jpeg") for size in thumb_sizes}
+    if webp:
+        outputs["webp"] = os.path.join(out_dir, f"{stem}.webp")
+    return outputs
+
+def is_up_to_date(path, outputs):
+    """True if every output exists and is newer than the input."""
+    source_mtime = os.path.getmtime(path)
+    return all(os.path.exists(out) and os.path.getmtime(out) >= source_mtime for out in outputs.values())
+
+def process_image(path, out_dir, thumb_sizes, webp, quality):
+    """
+    Decode path once and write all outputs for it.
+    Returns (path, status, bytes_in, bytes_out).
+    """
+    outputs = output_paths(path, out_dir, thumb_sizes, webp)
+    bytes_in = os.path.getsize(path)
+
+    if is_up_to_date(path, outputs):
+        return path, 'skipped', bytes_in, 0
+
+    try:
+        with Image.open(path) as img:
+            # Thumbnails only: let the JPEG decoder downscale while decoding
+            if not webp:
+                img.draft('RGB', (max(thumb_sizes), max(thumb_sizes)))
+            img.load()
+
+            if webp:
+                img.save(outputs["webp"], 'WEBP', quality=quality, method=4)
+
+            rgb = img.convert('RGB')
+            for size in thumb_sizes:
+                thumb = rgb.copy()
+                thumb.thumbnail((size, size))
+                thumb.save(outputs[f"thumb{size}"], 'JPEG', quality=85, optimize=True)
+    except (OSError, ValueError) as e:
+        return path, f"error: {str(e)[:100]}", bytes_in, 0
+
+    bytes_out = sum(os.path.getsize(out) for out in outputs.values())
+    return path, 'processed', bytes_in, bytes_out
+
+def process_all(paths, out_dir, thumb_sizes, webp, quality, workers):
+    """Process paths on a process pool, printing one line per image."""
+    os.makedirs(out_dir, exist_ok=True)
+    counts = {'processed': 0, 'skipped': 0, 'failed': 0}
+    total_in = 0
+    total_out = 0
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        n = len(paths)
+        results = pool.map(process_image,
+                           paths,
+                           [out_dir] * n, [thumb_sizes] * n, [webp] * n, [quality] * n,
+                           chunksize=max(1, n // (workers * 4)))
+
+        for path, status, bytes_in, bytes_out in results:
+            name = os.path.basename(path)
+            if status == 'processed':
+                counts['processed'] += 1
+                total_in += bytes_in
+                total_out += bytes_out
+                print(f"  ✅ {name}: {bytes_in // 1024} KB -> {bytes_out // 1024} KB")
+            elif status == 'skipped':
+                counts['skipped'] += 1
+            else:
+                counts['failed'] += 1
+                print(f"  ❌ {name}: {status}")
+
+    return counts, total_in, total_out
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    """Process every image in the input directory."""
+    args = create_parser().parse_args()
+    out_dir = args.out or os.path.join(args.input, "processed")
+    paths = find_images(args.input)
+
+    print(f"🖼️  Processing {len(paths)} image(s) with {args.workers} worker(s)...\n")
+    counts, total_in, total_out = process_all(paths, out_dir, args.thumb_sizes, args.webp, args.quality, args.workers)
+
+    print(f"\n📊 {counts['processed']} processed, {counts['skipped']} up to date, {counts['failed']} failed")
+    if total_in:
+        print(f"💾 {total_in // 1024} KB of originals -> {total_out // 1024} KB of outputs")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+import atexit
+import contextlib
+import glob
+import hashlib
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: Firefox's parent.lock is checked by opening it instead
+    fcntl = None
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+SNAPSHOT_ROOT = os.path.join(os.path.expanduser("~"), ".cache", "reddit-custom-feed", "profiles")
+SNAPSHOT_MAX_AGE = 24 * 3600  # Rebuild at least daily even if cookies look unchanged
+STALE_TEMP_AGE = 3600  # Leftover Selenium/geckodriver profile copies older than this are removed
+STAMP_FILE = ".snapshot"
+RUNS_SUFFIX = ".runs"  # <snapshot>.runs/run-* are the per-launch copies Firefox actually runs on
+
+# Everything a logged-in Reddit session needs; cache, history and extensions stay behind
+PROFILE_FILES = [
+    "cookies.sqlite",
+    "permissions.sqlite",
+    "webappsstore.sqlite",
+    "cert9.db",
+    "key4.db",
+    "prefs.js",
+    "containers.json",
+]
+PROFILE_DIRS = [
+    os.path.join("storage", "default", "https+++www.reddit.com"),
+]
+
+# Written as user.js so each launch copy stays small while Firefox runs on it
+SNAPSHOT_PREFS = {
+    "browser.cache.disk.enable": False,
+    "browser.cache.offline.enable": False,
+    "browser.sessionstore.resume_from_crash": False,
+    "browser.sessionstore.max_tabs_undo": 0,
+    "browser.shell.checkDefaultBrowser": False,
+    "browser.startup.page": 0,
+    "places.history.enabled": False,
+    "app.update.enabled": False,
+    "datareporting.healthreport.uploadEnabled": False,
+    "datareporting.policy.dataSubmissionEnabled": False,
+    "toolkit.telemetry.enabled": False,
+    "extensions.update.enabled": False,
+}
+
+# ============================================================================
+# SNAPSHOTS
+# ============================================================================
+
+def snapshot_path(source_profile):
+    """Snapshot directory for a source profile (one per profile path)."""
+    key = hashlib.sha1(os.path.abspath(source_profile).encode()).hexdigest()[:12]
+    return os.path.join(SNAPSHOT_ROOT, key)
+
+def needs_refresh(source_profile, snapshot):
+    """True if the snapshot is missing, too old, or the source cookies changed since it was taken."""
+    stamp = os.path.join(snapshot, STAMP_FILE)
+    if not os.path.exists(stamp):
+        return True
+
+    taken_at = os.path.getmtime(stamp)
+    if time.time() - taken_at > SNAPSHOT_MAX_AGE:
+        return True
+
+    for name in ("cookies.sqlite", "cookies.sqlite-wal"):
+        path = os.path.join(source_profile, name)
+        if os.path.exists(path) and os.path.getmtime(path) > taken_at:
+            return True
+    return False
+
+def copy_sqlite(src, dst):
+    """Copy a SQLite database consistently, even while Firefox has it open."""
+    try:
+        source = sqlite3.connect(f"file:{src}?mode=ro", uri=True)
+        target = sqlite3.connect(dst)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
+    except sqlite3.Error:
+        # Locked or not really SQLite - a plain copy is the best we can do
+        shutil.copy2(src, dst)
+
+@contextlib.contextmanager
+def snapshot_lock(snapshot):
+    """Hold an exclusive lock on snapshot while it is rebuilt or copied, so no process sees it half-swapped."""
+    os.makedirs(os.path.dirname(snapshot), exist_ok=True)
+    with open(snapshot + ".lock", 'a') as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        yield
+
+def build_snapshot(source_profile, snapshot):
+    """Copy the minimal profile subset into snapshot, replacing it atomically. Call under snapshot_lock."""
+    os.makedirs(os.path.dirname(snapshot), exist_ok=True)
+    staging = tempfile.mkdtemp(prefix="snapshot-", dir=os.path.dirname(snapshot))
+
+    for name in PROFILE_FILES:
+        src = os.path.join(source_profile, name)
+        if not os.path.exists(src):
+            continue
+        if name.endswith(".sqlite"):
+            copy_sqlite(src, os.path.join(staging, name))
+        else:
+            shutil.copy2(src, os.path.join(staging, name))
+
+    for name in PROFILE_DIRS:
+        src = os.path.join(source_profile, name)
+        if os.path.isdir(src):
+            shutil.copytree(src, os.path.join(staging, name))
+
+    with open(os.path.join(staging, "user.js"), 'w') as f:
+        for pref, value in SNAPSHOT_PREFS.items():
+            f.write(f'user_pref("{pref}", {str(value).lower()});\n')
+
+    open(os.path.join(staging, STAMP_FILE), 'w').close()
+
+    old = None
+    if os.path.exists(snapshot):
+        old = snapshot + f".old-{os.getpid()}"
+        os.replace(snapshot, old)
+    os.replace(staging, snapshot)
+    if old:
+        shutil.rmtree(old, ignore_errors=True)
+
+def pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+def profile_in_use(profile):
+    """True if a running Firefox holds the lock of the profile directory."""
+    # Linux/macOS: a 'lock' symlink to "<ip>:+<pid>" plus an fcntl lock on .parentlock
+    link = os.path.join(profile, "lock")
+    if os.path.islink(link):
+        pid = os.readlink(link).rpartition('+')[2]
+        if pid.isdigit() and pid_alive(int(pid)):
+            return True
+
+    for name in (".parentlock", "parent.lock"):
+        path = os.path.join(profile, name)
+        if not os.path.exists(path):
+            continue
+        try:
+            with open(path, 'a') as f:
+                if fcntl:
+                    fcntl.lockf(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    fcntl.lockf(f, fcntl.LOCK_UN)
+        except OSError:
+            return True
+    return False
+
+def remove_unused_profile(path, profile=None):
+    """rmtree path unless a running Firefox holds the profile in it. Returns True if removed."""
+    if profile_in_use(profile or path):
+        return False
+    shutil.rmtree(path, ignore_errors=True)
+    return True
+
+def cleanup_stale_temp_profiles(max_age=STALE_TEMP_AGE):
+    """
+    Remove profile copies Selenium and geckodriver left in the temp directory
+    (the reason /tmp used to fill up), and launch copies of dead processes.
+    Copies a running Firefox still holds are never removed, however old.
+    Returns how many were removed.
+    """
+    tmp = tempfile.gettempdir()
+    cutoff = time.time() - max_age
+    # (directory to remove, profile directory inside it)
+    candidates = [(p, p) for p in glob.glob(os.path.join(tmp, "rust_mozprofile*"))]
+    # Selenium's own copies are tmpXXXX dirs holding a webdriver-py-profilecopy
+    candidates += [(os.path.dirname(p), p) for p in glob.glob(os.path.join(tmp, "tmp*", "webdriver-py-profilecopy"))]
+    candidates += [(p, p) for p in glob.glob(os.path.join(SNAPSHOT_ROOT, "*" + RUNS_SUFFIX, "run-*"))]
+
+    removed = 0
+    for path, profile in candidates:
+        try:
+            if os.path.getmtime(path) < cutoff and remove_unused_profile(path, profile):
+                removed += 1
+        except OSError:
+            pass
+    return removed
+
+def launch_copy(snapshot):
+    """
+    Copy snapshot into a fresh directory for one Firefox process, so parallel
+    launches never share a profile lock. The copy is removed when this
+    process exits, unless a Firefox is still running on it.
+    """
+    runs = snapshot + RUNS_SUFFIX
+    os.makedirs(runs, exist_ok=True)
+    run_dir = tempfile.mkdtemp(prefix="run-", dir=runs)
+    shutil.copytree(snapshot, run_dir, dirs_exist_ok=True)
+    atexit.register(remove_unused_profile, run_dir)
+    return run_dir
+
+def prepare_profile(source_profile):
+    """
+    Return a private copy of an up-to-date slim snapshot of source_profile,
+    cleaning old temp copies on the way.
+    """
+    removed = cleanup_stale_temp_profiles()
+    if removed:
+        print(f"🧹 Removed {removed} stale temporary Firefox profile(s)")
+
+    snapshot = snapshot_path(source_profile)
+    with snapshot_lock(snapshot):
+        if needs_refresh(source_profile, snapshot):
+            print(f"📸 Refreshing profile snapshot in {snapshot}")
+            build_snapshot(source_profile, snapshot)
+        return launch_copy(snapshot)
+
+def use_profile_snapshot(options, source_profile):
+    """
+    Point Firefox options at a per-launch copy of the snapshot of
+    source_profile. The copy holds only the slim subset, so it is cheap, and
+    Firefox never runs on the snapshot itself, which can then be rebuilt at any time.
+    """
+    profile = prepare_profile(source_profile)
+    options.add_argument("-profile")
+    options.add_argument(profile)
+    return profile
@@ -3,9 +3,12 @@ from selenium.webdriver.firefox.options import Options
 import time
 import json
 
+from whole import REDDIT_URL, graphql_request
+from profile_manager import use_profile_snapshot
+
 profile_path = "/home/ismail/.mozilla/firefox/qrtlleto.default-esr"
 options = Options()
-options.profile = profile_path
+use_profile_snapshot(options, profile_path)
 driver = webdriver.Firefox(options=options)
 
 # Subreddit IDs we collected
@@ -27,7 +30,7 @@ subreddit_ids = {
     "whatsthatbook": "t5_2w9c6"
 }
 
-feed_url = "https://www.reddit.com/user/x_implement/m/books/"
+feed_url = f"{REDDIT_URL}/user/x_implement/m/books/"
 driver.get(feed_url)
 time.sleep(3)  # Wait for page to load
 
@@ -68,44 +71,10 @@ if not csrf_token:
 # Add each subreddit using JavaScript fetch
 for sub_name, sub_id in subreddit_ids.items():
     try:
-        result = driver.execute_script(
-            """
-            const payload = {
-                operation: "CustomFeedAddSubreddits",
-                variables: {
-                    label: "/user/x_implement/m/books/",
-                    subredditIds: [arguments[0]]
-                },
-                csrf_token: arguments[1]
-            };
-
-            return fetch('/svc/shreddit/graphql', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: JSON.stringify(payload),
-                credentials: 'include'
-            })
-            .then(response => {
-                return response.text().then(text => {
-                    let data;
-                    try {
-                        data = JSON.parse(text);
-                    } catch (e) {
-                        data = text.substring(0, 500);
-                    }
-                    return {
-                        status: response.status,
-                        statusText: response.statusText,
-                        data: data
-                    };
-                });
-            })
-            .catch(error => ({
-                error: error.toString()
-            }));
-        """, sub_id, csrf_token)
+        result = graphql_request(driver, "CustomFeedAddSubreddits", {
+            "label": "/user/x_implement/m/books/",
+            "subredditIds": [sub_id]
+        }, csrf_token)
 
         if 'error' in result:
             print(f"{sub_name} ({sub_id}): ERROR - {result['error']}")
@@ -0,0 +1,61 @@
+import requests
+from requests.adapters import HTTPAdapter
+import os
+import time
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+BASE_URL = os.environ.get("REDDIT_BASE_URL", "https://www.reddit.com").rstrip("/")
+USER_AGENT = "linux:reddit-custom-feed:1.0 (personal feed reader)"
+INFO_BATCH_SIZE = 100  # /api/info accepts at most 100 fullnames per request
+
+# ============================================================================
+# SESSION
+# ============================================================================
+
+def create_session(pool_size=10):
+    """Create a pooled requests session for Reddit's public JSON endpoints."""
+    session = requests.Session()
+    session.headers.update({"User-Agent": USER_AGENT})
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def get_json(session, path, params=None, base_url=BASE_URL):
+    """GET base_url + path and return the decoded JSON body."""
+    r = session.get(base_url + path, params=params, timeout=30)
+    r.raise_for_status()
+    return r.json()
+
+# ============================================================================
+# LOOKUPS
+# ============================================================================
+
+def chunked(items, size):
+    """Split items into lists of at most size elements."""
+    items = list(items)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+def fetch_info(session, fullnames, delay=1.0, base_url=BASE_URL):
+    """
+    Look up fullnames (t5_..., t3_...) through /api/info in batches of 100.
+    Returns {fullname: data} for every thing Reddit still knows about;
+    banned or deleted things are simply absent.
+    """
+    found = {}
+    batches = chunked(sorted(set(fullnames)), INFO_BATCH_SIZE)
+
+    for i, batch in enumerate(batches):
+        listing = get_json(session, "/api/info.json", {"id": ",".join(batch), "raw_json": 1}, base_url)
+        for child in listing.get("data", {}).get("children", []):
+            data = child.get("data", {})
+            if data.get("name"):
+                found[data["name"]] = data
+
+        if i < len(batches) - 1:
+            time.sleep(delay)
+
+    return found
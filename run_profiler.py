@@ -0,0 +1,141 @@
+import collections
+import io
+import os
+import time
+import tracemalloc
+
+# cProfile and pstats are imported only when a CPU profile is requested, so
+# importing this module for mark_phase costs nothing
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+TOP_FUNCTIONS = 50  # Rows in the sorted cProfile report
+TOP_ALLOCATIONS = 25  # Allocation sites listed per phase and at the end
+TRACE_FRAMES = 10  # Stack depth tracemalloc records per allocation
+MAX_PHASES = 200  # Phases kept for the report; long monitor runs keep the most recent ones
+
+# The profiler of the current run, so any code can mark phases without passing it around
+_active = None
+
+# ============================================================================
+# RUN PROFILER
+# ============================================================================
+
+def report_base(output_path, prefix):
+    """
+    Base path for reports: next to output_path if the run has one,
+    otherwise <prefix>-<timestamp> in the current directory.
+    """
+    stamp = time.strftime('%Y%m%d-%H%M%S')
+    if output_path:
+        return f"{os.path.splitext(output_path)[0]}-{stamp}"
+    return f"{prefix}-{stamp}"
+
+def mark_phase(name):
+    """Take a memory sample labelled name if a traced run is active; otherwise do nothing."""
+    if _active is not None:
+        _active.phase(name)
+
+class RunProfiler:
+    """
+    Context manager wrapping a run in cProfile and/or tracemalloc.
+
+    Writes <base>.prof (pstats dump, loadable by snakeviz/flameprof),
+    <base>.cprofile.txt (sorted stats) and <base>.memory.txt (peak, per-phase
+    samples and top allocation sites). Only the top sites of the last
+    MAX_PHASES phases are kept, so long runs stay cheap.
+
+    cProfile only sees the thread that entered the profiler: time spent on
+    background threads (network_debugger's output writer, the sync's ID
+    resolver) is missing from the CPU report. tracemalloc covers all threads.
+    """
+
+    def __init__(self, base, cpu=False, memory=False):
+        self.base = base
+        self.cpu = cpu
+        self.memory = memory
+        if cpu:
+            import cProfile
+            self.profiler = cProfile.Profile()
+        else:
+            self.profiler = None
+        self.phases = collections.deque(maxlen=MAX_PHASES)
+        self.phase_count = 0
+        self.peak = 0
+        self.previous_snapshot = None
+
+    def __enter__(self):
+        global _active
+        if self.memory:
+            tracemalloc.start(TRACE_FRAMES)
+        if self.profiler:
+            self.profiler.enable()
+        _active = self
+        return self
+
+    def phase(self, name):
+        """Record current traced memory, the peak since the last phase and the biggest growth since then."""
+        if not self.memory:
+            return
+
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ])
+        current, peak = tracemalloc.get_traced_memory()
+        # The next phase reports its own peak, not the run's
+        tracemalloc.reset_peak()
+        self.peak = max(self.peak, peak)
+
+        if self.previous_snapshot is None:
+            top = snapshot.statistics('lineno')[:TOP_ALLOCATIONS]
+        else:
+            top = snapshot.compare_to(self.previous_snapshot, 'lineno')[:TOP_ALLOCATIONS]
+        self.previous_snapshot = snapshot
+        self.phases.append((name, current, peak, [str(stat) for stat in top]))
+        self.phase_count += 1
+
+    def __exit__(self, exc_type, exc, tb):
+        global _active
+        _active = None
+
+        if self.profiler:
+            self.profiler.disable()
+            self.write_cpu_report()
+        if self.memory:
+            self.phase("end")
+            self.write_memory_report()
+            tracemalloc.stop()
+        return False
+
+    def write_cpu_report(self):
+        import pstats
+
+        self.profiler.dump_stats(f"{self.base}.prof")
+
+        text = io.StringIO()
+        stats = pstats.Stats(self.profiler, stream=text)
+        stats.sort_stats('cumulative').print_stats(TOP_FUNCTIONS)
+        stats.sort_stats('tottime').print_stats(TOP_FUNCTIONS)
+        with open(f"{self.base}.cprofile.txt", 'w') as f:
+            f.write(text.getvalue())
+
+        print(f"⏱️  CPU profile: {self.base}.prof, {self.base}.cprofile.txt")
+
+    def write_memory_report(self):
+        peak = self.peak
+        with open(f"{self.base}.memory.txt", 'w') as f:
+            f.write(f"Peak traced memory: {peak / 1024:.1f} KiB\n\n")
+            if self.phase_count > len(self.phases):
+                f.write(f"(only the last {len(self.phases)} of {self.phase_count} phases are listed)\n")
+            f.write(f"{'phase':<30} {'current KiB':>12} {'peak KiB':>12}\n")
+            for name, current, phase_peak, _ in self.phases:
+                f.write(f"{name:<30} {current / 1024:>12.1f} {phase_peak / 1024:>12.1f}\n")
+
+            for name, _, _, top in self.phases:
+                f.write(f"\n=== {name}: top allocation sites (growth since previous phase) ===\n")
+                f.write("\n".join(top) + "\n")
+
+        print(f"🧠 Memory report: {self.base}.memory.txt (peak {peak / 1024 / 1024:.1f} MiB)")
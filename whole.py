@@ -1,10 +1,23 @@
-from selenium import webdriver
-from selenium.webdriver.firefox.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 import time
 import json
 import os
+import re
+import sys
+import math
+import random
+import hashlib
+import argparse
+import contextlib
+import queue
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows: state files are updated unlocked
+    fcntl = None
+
+# Selenium, requests, asyncio, multiprocessing and the profiler are imported where they are
+# used, so the offline subcommands (plan, validate-spec, ...) start instantly.
 
 # ============================================================================
 # CONFIGURATION
@@ -12,7 +25,30 @@ import os
 
 PROFILE_PATH = "/home/ismail/.mozilla/firefox/qrtlleto.default-esr"
 USERNAME = "x_implement"
+REDDIT_URL = os.environ.get("REDDIT_BASE_URL", "https://www.reddit.com").rstrip("/")  # Override to replay a fixture server
 SUBREDDIT_IDS_FILE = "subreddit_ids.json"
+ACCOUNTS_FILE = "accounts.json"
+SUBREDDIT_INFO_FILE = "subreddit_info.json"
+RESOLVE_DELAY = 1.0  # Seconds between background /about.json lookups
+GRAPHQL_TIMEOUT = 20.0  # Seconds before an in-page GraphQL fetch is aborted
+GRAPHQL_TIMEOUT_RETRIES = 2  # Extra attempts for calls that timed out
+GRAPHQL_RETRY_BACKOFF = 2.0  # Seconds, multiplied by the attempt number
+SCRIPT_TIMEOUT_MARGIN = 10.0  # WebDriver's own deadline sits this far past GRAPHQL_TIMEOUT
+REMOVE_SUBREDDITS_OPERATION = "CustomFeedRemoveSubreddits"  # Mirrors CustomFeedAddSubreddits; not in the recorded requests
+# Timed-out calls of these are resent; a create may have been applied even though it timed out
+RETRY_SAFE_OPERATIONS = {"CustomFeedDelete", "CustomFeedAddSubreddits", REMOVE_SUBREDDITS_OPERATION}
+CSRF_MAX_AGE = 1800  # Seconds a daemon reuses its CSRF token before reloading the homepage
+
+MAX_FEED_SIZE = 100  # Reddit's member cap for a single custom feed
+SHARD_FILL = 0.75  # A feed's first sharding leaves each shard 75% full, so growth rarely adds a shard
+SHARD_STATE_FILE = "shard_state.json"  # Shard count each sharded feed was last created with
+
+STRATEGY_STATS_FILE = "strategy_stats.json"
+STRATEGY_SIZE_BUCKETS = [10, 25, 50, 100]
+STRATEGY_MIN_SAMPLES = 3  # Attempts needed before Approach 1 can be skipped
+STRATEGY_MIN_SUCCESS_RATE = 0.5
+STRATEGY_REPROBE_RATE = 0.1  # Chance of trying Approach 1 anyway, in case Reddit changed
+STRATEGY_TRANSIENT_ERRORS = {'timeout', 'network'}  # Say nothing about Approach 1, so not held against it
 
 FEEDS_DATA = {
     "Books": [
@@ -91,13 +127,65 @@ FEEDS_DATA = {
 # SELENIUM DRIVER SETUP
 # ============================================================================
 
-def initialize_driver():
-    """Initialize and return a Firefox WebDriver with the specified profile."""
+def initialize_driver(profile_path=PROFILE_PATH):
+    """Initialize and return a Firefox WebDriver running on a slim snapshot of the specified profile."""
+    from selenium import webdriver
+    from selenium.webdriver.firefox.options import Options
+    from profile_manager import use_profile_snapshot
+
     options = Options()
-    options.profile = PROFILE_PATH
+    use_profile_snapshot(options, profile_path)
     driver = webdriver.Firefox(options=options)
+    # Backstop only: in-page calls abort themselves after GRAPHQL_TIMEOUT
+    driver.set_script_timeout(GRAPHQL_TIMEOUT + SCRIPT_TIMEOUT_MARGIN)
     return driver
 
+# ============================================================================
+# ACCOUNTS AND FEED SPECS
+# ============================================================================
+
+class RequestThrottle:
+    """Enforce a minimum interval between GraphQL requests of one account."""
+
+    def __init__(self, min_interval=0.0):
+        self.min_interval = min_interval
+        self.last_request = 0.0
+
+    def wait(self):
+        delay = self.last_request + self.min_interval - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        self.last_request = time.monotonic()
+
+# One budget per process; each account runs in its own process
+REQUEST_THROTTLE = RequestThrottle()
+
+def load_feed_spec(filepath):
+    """
+    Load a {display name: [subreddits]} feed spec from JSON or from AsciiDoc
+    ('== Feed' sections of 'r/sub' lines), or FEEDS_DATA if filepath is None.
+    """
+    if not filepath:
+        return FEEDS_DATA
+    if filepath.endswith('.adoc'):
+        from feed_watch import SpecReader
+        return SpecReader(filepath).read()
+    with open(filepath, 'r') as f:
+        return json.load(f)
+
+def load_accounts(filepath):
+    """
+    Load the account list. Each entry has a username and profile, plus an
+    optional feeds spec path and min_request_interval in seconds.
+    """
+    with open(filepath, 'r') as f:
+        accounts = json.load(f)
+
+    for account in accounts:
+        if not account.get('username') or not account.get('profile'):
+            raise ValueError(f"Account entry needs 'username' and 'profile': {account}")
+    return accounts
+
 # ============================================================================
 # SUBREDDIT ID COLLECTION
 # ============================================================================
@@ -123,10 +211,22 @@ def load_subreddit_ids_from_file(filepath):
         print(f"❌ Error loading file: {e}")
         return {}
 
-def save_subreddit_ids_to_file(subreddit_ids, filepath):
-    """Save subreddit IDs to JSON file."""
-    with open(filepath, 'w') as f:
-        json.dump(subreddit_ids, f, indent=2)
+def save_subreddit_ids_to_file(subreddit_ids, filepath, merge=True):
+    """
+    Save subreddit IDs to JSON file. With merge, IDs other processes saved
+    meanwhile are kept; pass merge=False to drop entries on purpose.
+    """
+    if merge and os.path.exists(filepath):
+        try:
+            with open(filepath, 'r') as f:
+                subreddit_ids = {**json.load(f), **subreddit_ids}
+        except ValueError:
+            pass
+
+    tmp_path = f"{filepath}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(subreddit_ids, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, filepath)
     print(f"💾 Saved {len(subreddit_ids)} IDs to {filepath}")
 
 def scrape_subreddit_id(driver, subreddit_name):
@@ -134,8 +234,10 @@ def scrape_subreddit_id(driver, subreddit_name):
     Scrape the subreddit ID (t5_xxxxx) for a given subreddit.
     Returns the ID if found, None otherwise.
     """
+    from selenium.webdriver.common.by import By
+
     try:
-        url = f"https://www.reddit.com/r/{subreddit_name}/"
+        url = f"{REDDIT_URL}/r/{subreddit_name}/"
         driver.get(url)
         time.sleep(2)
 
@@ -219,13 +321,110 @@ def ensure_all_subreddit_ids(driver, all_subreddits, filepath):
     print(f"\n📊 Total IDs available: {len(subreddit_ids)} out of {len(all_subreddits)}\n")
     return subreddit_ids
 
+# ============================================================================
+# SUBREDDIT ID VALIDATION
+# ============================================================================
+
+def check_subreddit_ids(subreddit_ids):
+    """
+    Look up every cached t5_ ID via /api/info (100 per request) and check it
+    still belongs to the expected subreddit.
+    Returns {name: {id, status, subscribers, ...}} where status is 'ok',
+    'private', 'mismatch' (ID belongs to another subreddit) or 'missing'
+    (banned, deleted or a bad ID).
+    """
+    from reddit_api import create_session, fetch_info
+
+    found = fetch_info(create_session(), subreddit_ids.values())
+    checked_at = int(time.time())
+    report = {}
+
+    for name, sid in subreddit_ids.items():
+        data = found.get(sid)
+        entry = {'id': sid, 'checked_at': checked_at}
+
+        if data is None:
+            entry['status'] = 'missing'
+        else:
+            entry['actual_name'] = data.get('display_name')
+            entry['subscribers'] = data.get('subscribers')
+            entry['subreddit_type'] = data.get('subreddit_type')
+            if (data.get('display_name') or '').lower() != name.lower():
+                entry['status'] = 'mismatch'
+            elif data.get('subreddit_type') == 'private':
+                entry['status'] = 'private'
+            else:
+                entry['status'] = 'ok'
+
+        report[name] = entry
+
+    return report
+
+def load_subreddit_info(info_file=SUBREDDIT_INFO_FILE):
+    """Load the last validation report ({name: {id, status, ...}}). Returns {} if missing."""
+    if not os.path.exists(info_file):
+        return {}
+    try:
+        with open(info_file, 'r') as f:
+            return json.load(f)
+    except ValueError:
+        return {}
+
+def dead_subreddits(info_file=SUBREDDIT_INFO_FILE):
+    """Names the last validation did not find 'ok'. Sync, the daemon and watch leave them out."""
+    return {name for name, entry in load_subreddit_info(info_file).items() if entry.get('status') != 'ok'}
+
+def without_dead_subreddits(feeds_data, dead):
+    """Return feeds_data without the dead subreddits, printing the ones skipped."""
+    skipped = sorted(get_all_unique_subreddits(feeds_data) & dead, key=str.lower)
+    if skipped:
+        print(f"⏭️  Skipping {len(skipped)} dead or private subreddits: {', '.join(skipped)}\n")
+    return {name: [sub for sub in subs if sub not in dead] for name, subs in feeds_data.items()}
+
+def validate_subreddit_ids(ids_file, info_file=SUBREDDIT_INFO_FILE):
+    """
+    Validate the cached IDs in ids_file, drop the dead ones from it and
+    record subscriber counts and status in info_file. Names found dead
+    before are checked again by their last ID and restored if they are ok now.
+    Returns the names that are dead.
+    """
+    subreddit_ids = load_subreddit_ids_from_file(ids_file)
+    previous = load_subreddit_info(info_file)
+    recheck = {name: entry['id'] for name, entry in previous.items()
+               if entry.get('status') != 'ok' and entry.get('id') and name not in subreddit_ids}
+    if not subreddit_ids and not recheck:
+        return []
+
+    print(f"🔎 Validating {len(subreddit_ids)} cached and {len(recheck)} previously dead subreddit IDs...")
+    report = check_subreddit_ids({**recheck, **subreddit_ids})
+
+    dead = sorted(name for name, entry in report.items() if entry['status'] != 'ok')
+    for name in dead:
+        entry = report[name]
+        detail = f" (belongs to r/{entry['actual_name']})" if entry['status'] == 'mismatch' else ""
+        print(f"  ❌ {name} ({entry['id']}): {entry['status']}{detail}")
+        subreddit_ids.pop(name, None)
+
+    revived = sorted(name for name in recheck if report[name]['status'] == 'ok')
+    for name in revived:
+        print(f"  ♻️  {name} ({recheck[name]}): ok again")
+        subreddit_ids[name] = recheck[name]
+
+    with open(info_file, 'w') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+    if set(dead) - set(recheck) or revived:
+        save_subreddit_ids_to_file(subreddit_ids, ids_file, merge=False)
+    print(f"✅ {len(report) - len(dead)} valid, {len(dead)} dead and skipped by sync (details in {info_file})\n")
+    return dead
+
 # ============================================================================
 # CSRF TOKEN
 # ============================================================================
 
 def get_csrf_token(driver):
     """Extract CSRF token from Reddit page."""
-    driver.get("https://www.reddit.com/")
+    driver.get(f"{REDDIT_URL}/")
     time.sleep(3)
 
     csrf_token = driver.execute_script("""
@@ -261,6 +460,130 @@ def get_csrf_token(driver):
 
     return csrf_token
 
+# ============================================================================
+# PAGE-SIDE GRAPHQL HELPER
+# ============================================================================
+
+# Installed once per page; every call afterwards only ships its arguments.
+# Each fetch (body included) is aborted after timeout_ms and reported as { timeout: true }.
+GRAPHQL_HELPER_SCRIPT = """
+    window.__feedGql = function (operation, variables, csrf_token, timeout_ms) {
+        const payload = {
+            operation: operation,
+            variables: variables,
+            csrf_token: csrf_token
+        };
+        const controller = new AbortController();
+        const timer = setTimeout(() => controller.abort(), timeout_ms);
+
+        return fetch('/svc/shreddit/graphql', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            credentials: 'include',
+            body: JSON.stringify(payload),
+            signal: controller.signal
+        })
+        .then(response => response.text().then(text => {
+            let data;
+            try { data = JSON.parse(text); }
+            catch (e) { data = text.slice(0, 500); }
+            return { status: response.status, statusText: response.statusText, data: data };
+        }))
+        .catch(error => error.name === 'AbortError'
+            ? { timeout: true, error: `${operation} timed out after ${timeout_ms}ms` }
+            : { error: error.toString() })
+        .finally(() => clearTimeout(timer));
+    };
+"""
+
+# Run as async scripts: the last argument is WebDriver's completion callback
+GRAPHQL_CALL_SCRIPT = """
+    const done = arguments[arguments.length - 1];
+    if (!window.__feedGql) { done({ helperMissing: true }); return; }
+    window.__feedGql(arguments[0], arguments[1], arguments[2], arguments[3]).then(done);
+"""
+
+FEED_LIST_SCRIPT = """
+    const done = arguments[arguments.length - 1];
+    fetch('/api/multi/mine.json?expand_srs=true', { credentials: 'include' })
+        .then(response => response.ok ? response.json() : null)
+        .then(done, () => done(null));
+"""
+
+GRAPHQL_BATCH_SCRIPT = """
+    const done = arguments[arguments.length - 1];
+    if (!window.__feedGql) { done({ helperMissing: true }); return; }
+    const [calls, csrf_token, timeout_ms] = arguments;
+    Promise.all(calls.map(call => window.__feedGql(call[0], call[1], csrf_token, timeout_ms))).then(done);
+"""
+
+def install_graphql_helper(driver):
+    """Install window.__feedGql on the current page."""
+    driver.execute_script(GRAPHQL_HELPER_SCRIPT)
+
+def run_page_script(driver, script, *args):
+    """
+    Run one of the async GraphQL scripts, reinstalling the helper if navigation
+    wiped it. A page too stuck to even abort its fetch hits WebDriver's script
+    timeout instead, which is reported the same way as an in-page timeout.
+    """
+    from selenium.common.exceptions import TimeoutException
+
+    try:
+        result = driver.execute_async_script(script, *args)
+        if isinstance(result, dict) and result.get('helperMissing'):
+            install_graphql_helper(driver)
+            result = driver.execute_async_script(script, *args)
+    except TimeoutException:
+        return {'timeout': True, 'error': "page script timed out"}
+    return result
+
+def is_timeout(result):
+    return isinstance(result, dict) and result.get('timeout')
+
+def graphql_request(driver, operation, variables, csrf_token, timeout=GRAPHQL_TIMEOUT, retries=GRAPHQL_TIMEOUT_RETRIES):
+    """
+    Run a GraphQL operation through window.__feedGql, aborting it after timeout
+    seconds. Timed-out calls of RETRY_SAFE_OPERATIONS are retried up to retries
+    times with backoff; any other operation's timeout is returned to the caller.
+    Returns {status, statusText, data}, {error} or {timeout, error}.
+    """
+    for attempt in range(retries + 1):
+        REQUEST_THROTTLE.wait()
+        result = run_page_script(driver, GRAPHQL_CALL_SCRIPT, operation, variables, csrf_token, int(timeout * 1000))
+        if not is_timeout(result) or attempt == retries or operation not in RETRY_SAFE_OPERATIONS:
+            return result
+        print(f"  ⏱️  {result['error']}, retrying ({attempt + 1}/{retries})")
+        time.sleep(GRAPHQL_RETRY_BACKOFF * (attempt + 1))
+    return result
+
+def graphql_batch(driver, calls, csrf_token, timeout=GRAPHQL_TIMEOUT, retries=GRAPHQL_TIMEOUT_RETRIES):
+    """
+    Run several (operation, variables) calls concurrently inside the page,
+    each aborted after timeout seconds. Only the calls of RETRY_SAFE_OPERATIONS
+    that timed out are retried. Returns one result per call, in order.
+    """
+    calls = [[operation, variables] for operation, variables in calls]
+    results = [None] * len(calls)
+    pending = list(range(len(calls)))
+
+    for attempt in range(retries + 1):
+        REQUEST_THROTTLE.wait()
+        batch = run_page_script(driver, GRAPHQL_BATCH_SCRIPT, [calls[i] for i in pending], csrf_token, int(timeout * 1000))
+        if not isinstance(batch, list) or len(batch) != len(pending):
+            # A script-level timeout or error applies to every call that was in flight
+            error = batch if isinstance(batch, dict) else {'error': f"unexpected batch result: {str(batch)[:100]}"}
+            batch = [error] * len(pending)
+        for i, result in zip(pending, batch):
+            results[i] = result
+
+        pending = [i for i in pending if is_timeout(results[i]) and calls[i][0] in RETRY_SAFE_OPERATIONS]
+        if not pending or attempt == retries:
+            break
+        print(f"  ⏱️  {len(pending)} call(s) timed out, retrying ({attempt + 1}/{retries})")
+        time.sleep(GRAPHQL_RETRY_BACKOFF * (attempt + 1))
+    return results
+
 # ============================================================================
 # FEED MANAGEMENT
 # ============================================================================
@@ -269,50 +592,60 @@ def generate_feed_slug(display_name):
     """Convert display name to URL slug (lowercase, no spaces/ampersands)."""
     return display_name.lower().replace('&', '').replace(' ', '')
 
+def find_feed(driver, display_name):
+    """The user's feed list entry ('data' of the multi) for display_name, None if absent or the list could not be fetched."""
+    multis = run_page_script(driver, FEED_LIST_SCRIPT)
+    if not isinstance(multis, list):
+        return None
+    slug = generate_feed_slug(display_name)
+    for multi in multis:
+        data = multi.get('data', {}) if isinstance(multi, dict) else {}
+        if data.get('display_name') == display_name or data.get('name') == slug:
+            return data
+    return None
+
+def list_feed_slugs(driver):
+    """Set of the slugs of the user's custom feeds, None if the list could not be fetched."""
+    multis = run_page_script(driver, FEED_LIST_SCRIPT)
+    if not isinstance(multis, list):
+        return None
+    return {multi['data']['name'].lower() for multi in multis
+            if isinstance(multi, dict) and multi.get('data', {}).get('name')}
+
+def created_despite_timeout(driver, display_name, create_result, subreddit_ids):
+    """
+    A timed-out CustomFeedCreate may still have been applied, and resending it
+    would fail on the duplicate name. True if the create timed out and the feed
+    now holds exactly subreddit_ids. A feed that merely exists proves nothing,
+    as it may be an old one whose delete failed.
+    """
+    if not is_timeout(create_result):
+        return False
+    feed = find_feed(driver, display_name)
+    if feed is None:
+        return False
+
+    members = feed.get('subreddits') or []
+    member_ids = {sr['data']['name'] for sr in members if isinstance(sr.get('data'), dict) and sr['data'].get('name')}
+    if len(member_ids) == len(members):
+        matches = member_ids == set(subreddit_ids)
+    else:
+        # Entries without IDs can only be counted
+        matches = len(members) == len(subreddit_ids)
+
+    if matches:
+        print(f"  ⏱️  {display_name}: create timed out, but the feed exists with its {len(subreddit_ids)} subreddits")
+        return True
+    print(f"  ⚠️  {display_name}: create timed out and the existing feed doesn't hold the expected "
+          f"{len(subreddit_ids)} subreddits - not taking it as created")
+    return False
+
 def delete_custom_feed(driver, username, feed_name, csrf_token):
     """Delete a custom feed by name. Returns True if successful."""
     feed_label = f"/user/{username}/m/{feed_name}/"
 
     try:
-        delete_result = driver.execute_script(
-            """
-            const payload = {
-                operation: "CustomFeedDelete",
-                variables: {
-                    input: {
-                        label: arguments[0]
-                    }
-                },
-                csrf_token: arguments[1]
-            };
-
-            return fetch('/svc/shreddit/graphql', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: JSON.stringify(payload),
-                credentials: 'include'
-            })
-            .then(response => {
-                return response.text().then(text => {
-                    let data;
-                    try {
-                        data = JSON.parse(text);
-                    } catch (e) {
-                        data = text.substring(0, 500);
-                    }
-                    return {
-                        status: response.status,
-                        statusText: response.statusText,
-                        data: data
-                    };
-                });
-            })
-            .catch(error => ({
-                error: error.toString()
-            }));
-        """, feed_label, csrf_token)
+        delete_result = graphql_request(driver, "CustomFeedDelete", {"input": {"label": feed_label}}, csrf_token)
 
         if 'error' in delete_result:
             print(f"  ❌ {feed_name}: ERROR - {delete_result['error']}")
@@ -329,8 +662,11 @@ def delete_custom_feed(driver, username, feed_name, csrf_token):
         return False
 
 def delete_all_existing_feeds(driver, username, feeds_data, csrf_token):
-    """Delete all existing custom feeds based on feeds_data keys."""
-    existing_feeds = [generate_feed_slug(feed_name) for feed_name in feeds_data.keys()]
+    """Delete all existing custom feeds based on feeds_data keys (and their shards)."""
+    existing_feeds = []
+    live_slugs = list_feed_slugs(driver)
+    for display_name, subreddits in feeds_data.items():
+        existing_feeds += feed_slugs_to_delete(display_name, subreddits, live_slugs)
 
     print(f"{'='*60}")
     print(f"🗑️  Deleting {len(existing_feeds)} existing custom feeds...")
@@ -348,126 +684,78 @@ def delete_all_existing_feeds(driver, username, feeds_data, csrf_token):
 
     print(f"\n✅ Deletion complete: {deleted_count} deleted, {failed_count} failed\n")
     time.sleep(2)
+    return deleted_count, failed_count
 
 def create_feed_with_all_subreddits(driver, display_name, subreddit_ids, csrf_token):
     """
     APPROACH 1: Create feed with all subreddits in one request (faster but sometimes fails).
-    Returns True if successful, False otherwise.
+    Returns (True, None) if successful, otherwise (False, error type).
     """
     print(f"📝 Approach 1: Creating feed with all subreddits at once...")
 
-    create_result = driver.execute_script(
-        """
-        const payload = {
-            operation: "CustomFeedCreate",
-            variables: {
-                input: {
-                    displayName: arguments[0],
-                    descriptionMd: "",
-                    visibility: "PUBLIC",
-                    subredditIds: arguments[1]
-                }
-            },
-            csrf_token: arguments[2]
-        };
-
-        return fetch('/svc/shreddit/graphql', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-            },
-            body: JSON.stringify(payload),
-            credentials: 'include'
-        })
-        .then(response => {
-            return response.text().then(text => {
-                let data;
-                try {
-                    data = JSON.parse(text);
-                } catch (e) {
-                    data = text.substring(0, 500);
-                }
-                return {
-                    status: response.status,
-                    statusText: response.statusText,
-                    data: data
-                };
-            });
-        })
-        .catch(error => ({
-            error: error.toString()
-        }));
-    """, display_name, subreddit_ids, csrf_token)
+    create_result = graphql_request(driver, "CustomFeedCreate", {
+        "input": {
+            "displayName": display_name,
+            "descriptionMd": "",
+            "visibility": "PUBLIC",
+            "subredditIds": subreddit_ids
+        }
+    }, csrf_token)
 
     # Check if creation succeeded
+    failure = create_feed_failure(create_result)
+    if failure and created_despite_timeout(driver, display_name, create_result, subreddit_ids):
+        failure = None
+    if failure:
+        print(f"⚠️  Approach 1 failed: {failure}")
+        return False, create_failure_type(create_result)
+
+    print(f"✅ Approach 1 succeeded - Feed created with all subreddits!")
+    return True, None
+
+def create_feed_failure(create_result):
+    """Return why a CustomFeedCreate call failed, or None if the feed was created."""
     if 'error' in create_result:
-        print(f"⚠️  Approach 1 failed with error: {create_result['error']}")
-        return False
+        return f"error - {create_result['error']}"
     elif create_result['status'] != 200:
-        print(f"⚠️  Approach 1 failed: {create_result['status']} {create_result['statusText']}")
-        return False
+        return f"{create_result['status']} {create_result['statusText']}"
 
     response_data = create_result.get('data', {})
-    if isinstance(response_data, dict):
-        errors = response_data.get('errors', [])
-        create_data = response_data.get('data', {})
-
-        if errors or (create_data and create_data.get('createMultireddit') is None):
-            print(f"⚠️  Approach 1 failed - Reddit returned errors")
-            if errors:
-                print(f"   Error details: {errors[0].get('message', 'Unknown error')[:100]}")
-            return False
-        else:
-            print(f"✅ Approach 1 succeeded - Feed created with all subreddits!")
-            return True
-
-    return False
+    if not isinstance(response_data, dict):
+        return "unexpected response"
+
+    errors = response_data.get('errors', [])
+    create_data = response_data.get('data', {})
+    if errors or (create_data and create_data.get('createMultireddit') is None):
+        if errors:
+            return f"Reddit returned errors - {errors[0].get('message', 'Unknown error')[:100]}"
+        return "Reddit returned errors"
+
+    return None
+
+def create_failure_type(create_result):
+    """Classify a failed CustomFeedCreate result for the strategy stats."""
+    if create_result.get('timeout'):
+        return 'timeout'
+    elif 'error' in create_result:
+        return 'network'
+    elif create_result['status'] != 200:
+        return f"http_{create_result['status']}"
+    return 'graphql'
 
 def create_empty_feed(driver, display_name, csrf_token):
     """Create an empty custom feed. Returns True if successful."""
-    create_result = driver.execute_script(
-        """
-        const payload = {
-            operation: "CustomFeedCreate",
-            variables: {
-                input: {
-                    displayName: arguments[0],
-                    descriptionMd: "",
-                    visibility: "PUBLIC",
-                    subredditIds: []
-                }
-            },
-            csrf_token: arguments[1]
-        };
-
-        return fetch('/svc/shreddit/graphql', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-            },
-            body: JSON.stringify(payload),
-            credentials: 'include'
-        })
-        .then(response => {
-            return response.text().then(text => {
-                let data;
-                try {
-                    data = JSON.parse(text);
-                } catch (e) {
-                    data = text.substring(0, 500);
-                }
-                return {
-                    status: response.status,
-                    statusText: response.statusText,
-                    data: data
-                };
-            });
-        })
-        .catch(error => ({
-            error: error.toString()
-        }));
-    """, display_name, csrf_token)
+    create_result = graphql_request(driver, "CustomFeedCreate", {
+        "input": {
+            "displayName": display_name,
+            "descriptionMd": "",
+            "visibility": "PUBLIC",
+            "subredditIds": []
+        }
+    }, csrf_token)
 
+    if created_despite_timeout(driver, display_name, create_result, []):
+        return True
     if 'error' in create_result:
         print(f"❌ ERROR creating empty feed: {create_result['error']}")
         return False
@@ -493,32 +781,10 @@ def add_subreddit_to_feed(driver, username, feed_slug, subreddit_id, csrf_token)
     """Add a single subreddit to a feed. Returns True if successful."""
     feed_label = f"/user/{username}/m/{feed_slug}/"
 
-    add_result = driver.execute_script(
-        """
-        const label = arguments[0];
-        const subredditId = arguments[1];
-        const csrf_token = arguments[2];
-
-        const payload = {
-            operation: "CustomFeedAddSubreddits",
-            variables: { label: label, subredditIds: [subredditId] },
-            csrf_token: csrf_token
-        };
-
-        return fetch('/svc/shreddit/graphql', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            credentials: 'include',
-            body: JSON.stringify(payload)
-        })
-        .then(response => response.text().then(text => {
-            let data;
-            try { data = JSON.parse(text); }
-            catch (e) { data = text.slice(0,500); }
-            return { status: response.status, statusText: response.statusText, data: data };
-        }))
-        .catch(error => ({ error: error.toString() }));
-    """, feed_label, subreddit_id, csrf_token)
+    add_result = graphql_request(driver, "CustomFeedAddSubreddits", {
+        "label": feed_label,
+        "subredditIds": [subreddit_id]
+    }, csrf_token)
 
     result_data = {}
     if isinstance(add_result, dict):
@@ -547,6 +813,20 @@ def add_subreddits_to_feed(driver, username, feed_slug, subreddit_ids, csrf_toke
     print(f"✅ Added {success_count}/{len(subreddit_ids)} subreddits")
     return success_count == len(subreddit_ids)
 
+def change_feed_members(driver, username, feed_slug, operation, subreddit_ids, csrf_token):
+    """Add or remove several subreddits in one mutation. Returns True if Reddit accepted it."""
+    result = graphql_request(driver, operation, {
+        "label": f"/user/{username}/m/{feed_slug}/",
+        "subredditIds": subreddit_ids
+    }, csrf_token)
+
+    if not isinstance(result, dict) or result.get('status') != 200 or not isinstance(result.get('data'), dict):
+        return False
+    if result['data'].get('errors'):
+        return False
+    payload = next(iter((result['data'].get('data') or {}).values()), None)
+    return isinstance(payload, dict) and payload.get('ok', False)
+
 def create_feed_empty_then_add(driver, username, display_name, subreddit_ids, csrf_token):
     """
     APPROACH 2: Create empty feed then add subreddits one by one (slower but more reliable).
@@ -562,7 +842,7 @@ def create_feed_empty_then_add(driver, username, display_name, subreddit_ids, cs
         return False
 
     # Navigate to the feed page before adding subreddits
-    feed_url = f"https://www.reddit.com{feed_label}"
+    feed_url = f"{REDDIT_URL}{feed_label}"
     print(f"🔄 Navigating to {feed_url}...")
     driver.get(feed_url)
     time.sleep(3)
@@ -582,6 +862,7 @@ def create_feed_with_subreddits(driver, username, display_name, subreddit_ids, c
     """
     Create a custom feed and populate it with subreddits.
     Tries Approach 1 (fast) first, falls back to Approach 2 (reliable) if it fails.
+    Approach 1 is skipped when the strategy stats say it rarely works for feeds this size.
     """
     feed_slug = generate_feed_slug(display_name)
     feed_label = f"/user/{username}/m/{feed_slug}/"
@@ -591,14 +872,25 @@ def create_feed_with_subreddits(driver, username, display_name, subreddit_ids, c
     print(f"{'='*60}")
     print(f"📚 Total subreddits: {len(subreddit_ids)}")
 
+    stats = load_strategy_stats()
+    feed_size = len(subreddit_ids)
+
     # APPROACH 1: Try creating feed with all subreddits at once (faster)
-    if create_feed_with_all_subreddits(driver, display_name, subreddit_ids, csrf_token):
-        print(f"✅ Feed URL: https://www.reddit.com{feed_label}")
-        return True
+    if choose_create_strategy(stats, feed_size) == 'bulk':
+        success, error_type = create_feed_with_all_subreddits(driver, display_name, subreddit_ids, csrf_token)
+        record_strategy_outcome('bulk', feed_size, success, error_type)
+        if success:
+            print(f"✅ Feed URL: {REDDIT_URL}{feed_label}")
+            return True
+    else:
+        rate, attempts = bulk_success_rate(stats, feed_size)
+        print(f"⏭️  Skipping Approach 1 - {rate:.0%} success over {attempts} attempts for feeds this size")
 
     # APPROACH 2: If Approach 1 failed, create empty feed then add subreddits
-    if create_feed_empty_then_add(driver, username, display_name, subreddit_ids, csrf_token):
-        print(f"✅ Feed URL: https://www.reddit.com{feed_label}")
+    success = create_feed_empty_then_add(driver, username, display_name, subreddit_ids, csrf_token)
+    record_strategy_outcome('incremental', feed_size, success, None if success else 'partial')
+    if success:
+        print(f"✅ Feed URL: {REDDIT_URL}{feed_label}")
         return True
 
     print(f"❌ Failed to create feed: {display_name}")
@@ -610,52 +902,1058 @@ def create_all_feeds(driver, username, feeds_data, subreddit_ids, csrf_token):
     print(f"📝 Creating {len(feeds_data)} new custom feeds...")
     print(f"{'='*60}\n")
 
+    failed_feeds = []
     for feed_display_name, subreddits in feeds_data.items():
-        # Get subreddit IDs for this feed
-        feed_subreddit_ids = []
-        missing_subs = []
+        failed_feeds += create_feed(driver, username, feed_display_name, subreddits, subreddit_ids, csrf_token)
+        time.sleep(2)
 
-        for sub_name in subreddits:
-            if sub_name in subreddit_ids:
-                feed_subreddit_ids.append(subreddit_ids[sub_name])
-            else:
-                missing_subs.append(sub_name)
+    return failed_feeds
 
-        if missing_subs:
-            print(f"⚠️  Missing IDs for: {', '.join(missing_subs)}")
+def create_feed(driver, username, display_name, subreddits, subreddit_ids, csrf_token):
+    """
+    Create one feed from subreddit names, sharding it if it is over the cap.
+    Returns the names of feeds/shards that failed.
+    """
+    # Get subreddit IDs for this feed
+    missing_subs = [sub_name for sub_name in subreddits if sub_name not in subreddit_ids]
+    if missing_subs:
+        print(f"⚠️  Missing IDs for: {', '.join(missing_subs)}")
+
+    # Oversized feeds are split into shards, created concurrently. Shards come from
+    # the names, like feed_slugs_to_delete, so resolving an ID never moves a shard
+    shards = shard_feed(display_name, subreddits)
+    if len(shards) > 1:
+        save_shard_count(display_name, len(shards))
+    shard_ids = {name: [subreddit_ids[sub] for sub in subs if sub in subreddit_ids] for name, subs in shards.items()}
+
+    if len(shard_ids) > 1:
+        return create_feed_shards(driver, username, shard_ids, csrf_token)
+    elif not create_feed_with_subreddits(driver, username, display_name, shard_ids[display_name], csrf_token):
+        return [display_name]
+    return []
+
+def feed_slugs_to_delete(display_name, subreddits, live_slugs=None):
+    """
+    Slugs a feed may exist under: its own name (in case it only just outgrew
+    the cap), its shards, and the "<name>-N" shards of an earlier layout
+    (fewer, more, or none at all now that it fits). Old shards are taken from
+    live_slugs, the user's feeds as listed by list_feed_slugs; without it,
+    every shard up to the recorded shard count is included.
+    """
+    slug = generate_feed_slug(display_name)
+    slugs = dict.fromkeys(generate_feed_slug(name)
+                          for name in [display_name, *shard_feed(display_name, subreddits).keys()])
+    if live_slugs is not None:
+        shard_slug = re.compile(rf'{re.escape(slug)}-\d+')
+        slugs.update(dict.fromkeys(sorted(name for name in live_slugs if shard_slug.fullmatch(name))))
+    else:
+        slugs.update(dict.fromkeys(f"{slug}-{i + 1}" for i in range(load_shard_counts().get(display_name, 0))))
+    return list(slugs)
+
+# ============================================================================
+# PIPELINED SYNC
+# ============================================================================
 
-        # Create the feed
-        create_feed_with_subreddits(driver, username, feed_display_name, feed_subreddit_ids, csrf_token)
+def resolve_subreddit_id(session, subreddit_name):
+    """Look up a subreddit's t5_ ID through /r/<name>/about.json. Returns None if unavailable."""
+    import requests
+    from reddit_api import get_json
 
+    try:
+        data = get_json(session, f"/r/{subreddit_name}/about.json").get('data', {})
+    except (requests.RequestException, ValueError):
+        return None
+
+    sid = data.get('name')
+    return sid if sid and sid.startswith('t5_') else None
+
+def sync_feeds_pipelined(driver, username, feeds_data, subreddit_ids, csrf_token):
+    """
+    Delete and recreate each feed as soon as all its subreddit IDs are known.
+    Missing IDs are resolved over HTTP on a background thread that pushes
+    feeds onto a ready queue, while this thread (the only one touching the
+    browser) drains that queue. Feeds whose IDs are all cached start at once.
+    Updates subreddit_ids in place. Returns (deleted count, failed feed names).
+    """
+    from reddit_api import create_session
+    from run_profiler import mark_phase
+
+    ready_feeds = queue.Queue()
+    lock = threading.Lock()
+    waiting = {name: {sub for sub in subs if sub not in subreddit_ids} for name, subs in feeds_data.items()}
+    missing_names = sorted(set().union(*waiting.values()))
+
+    for name, missing in waiting.items():
+        if not missing:
+            ready_feeds.put(name)
+
+    print(f"🚦 {ready_feeds.qsize()} feeds ready, {len(missing_names)} subreddit IDs resolving in background\n")
+
+    def release(sub):
+        for name, missing in waiting.items():
+            if sub in missing:
+                missing.discard(sub)
+                if not missing:
+                    ready_feeds.put(name)
+
+    def resolve_missing():
+        try:
+            session = create_session()
+            for sub in missing_names:
+                sid = resolve_subreddit_id(session, sub)
+                with lock:
+                    if sid:
+                        subreddit_ids[sub] = sid
+                        print(f"  🔎 {sub}: {sid}")
+                    else:
+                        print(f"  🔎 {sub}: ID not found")
+                    release(sub)
+                time.sleep(RESOLVE_DELAY)
+        finally:
+            # Never leave the creator waiting on a feed, even if resolving crashed
+            with lock:
+                for sub in missing_names:
+                    release(sub)
+
+    resolver = threading.Thread(target=resolve_missing, name='id-resolver', daemon=True)
+    resolver.start()
+
+    deleted = 0
+    failed_feeds = []
+    live_slugs = list_feed_slugs(driver)
+    for _ in range(len(feeds_data)):
+        display_name = ready_feeds.get()
+        subreddits = feeds_data[display_name]
+
+        for slug in feed_slugs_to_delete(display_name, subreddits, live_slugs):
+            if delete_custom_feed(driver, username, slug, csrf_token):
+                deleted += 1
+            time.sleep(1)
+
+        with lock:
+            feed_ids = {sub: subreddit_ids[sub] for sub in subreddits if sub in subreddit_ids}
+        failed_feeds += create_feed(driver, username, display_name, subreddits, feed_ids, csrf_token)
+        mark_phase(f"feed {display_name}")
         time.sleep(2)
 
+    resolver.join()
+    return deleted, failed_feeds
+
+# ============================================================================
+# CREATE STRATEGY STATS
+# ============================================================================
+
+def strategy_size_bucket(feed_size):
+    """Group feed sizes so outcomes of similar feeds are pooled."""
+    for limit in STRATEGY_SIZE_BUCKETS:
+        if feed_size <= limit:
+            return f"<={limit}"
+    return f">{STRATEGY_SIZE_BUCKETS[-1]}"
+
+@contextlib.contextmanager
+def state_file_lock(filepath):
+    """Hold an exclusive lock on filepath across a read-modify-write, so parallel account syncs don't lose updates."""
+    with open(filepath + ".lock", 'a') as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        yield
+
+def load_strategy_stats(filepath=STRATEGY_STATS_FILE):
+    """Load {strategy: {size bucket: {success, failure, errors}}}. Returns {} if missing."""
+    if not os.path.exists(filepath):
+        return {}
+    try:
+        with open(filepath, 'r') as f:
+            return json.load(f)
+    except ValueError:
+        return {}
+
+def record_strategy_outcome(strategy, feed_size, success, error_type=None, filepath=STRATEGY_STATS_FILE):
+    """Add one create attempt to the stats file ('bulk' is Approach 1, 'incremental' Approach 2)."""
+    with state_file_lock(filepath):
+        stats = load_strategy_stats(filepath)
+        bucket = stats.setdefault(strategy, {}).setdefault(strategy_size_bucket(feed_size), {
+            'success': 0,
+            'failure': 0,
+            'errors': {}
+        })
+
+        if success:
+            bucket['success'] += 1
+        else:
+            error_type = error_type or 'unknown'
+            bucket['failure'] += 1
+            bucket['errors'][error_type] = bucket['errors'].get(error_type, 0) + 1
+
+        tmp_path = f"{filepath}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(stats, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, filepath)
+
+def bulk_success_rate(stats, feed_size):
+    """
+    Return (smoothed success rate, attempts) of Approach 1 for feeds of this
+    size. Timeouts and network errors are not counted as attempts.
+    """
+    bucket = stats.get('bulk', {}).get(strategy_size_bucket(feed_size), {})
+    success = bucket.get('success', 0)
+    transient = sum(count for kind, count in bucket.get('errors', {}).items() if kind in STRATEGY_TRANSIENT_ERRORS)
+    attempts = success + bucket.get('failure', 0) - transient
+    return (success + 1) / (attempts + 2), attempts
+
+def choose_create_strategy(stats, feed_size):
+    """
+    Pick 'bulk' (Approach 1 first) or 'incremental' (straight to Approach 2)
+    from past outcomes for feeds of this size. Approach 1 is kept until there
+    is enough evidence against it, and is re-probed now and then.
+    """
+    rate, attempts = bulk_success_rate(stats, feed_size)
+    if attempts < STRATEGY_MIN_SAMPLES or rate >= STRATEGY_MIN_SUCCESS_RATE:
+        return 'bulk'
+    if random.random() < STRATEGY_REPROBE_RATE:
+        return 'bulk'
+    return 'incremental'
+
+# ============================================================================
+# FEED SHARDING
+# ============================================================================
+
+def stable_hash(name):
+    """64-bit hash of a subreddit name that is the same on every run and machine."""
+    return int.from_bytes(hashlib.sha1(name.lower().encode()).digest()[:8], 'big')
+
+def jump_consistent_hash(key, num_buckets):
+    """
+    Map key to a bucket in [0, num_buckets) (Lamping & Veach). Growing
+    num_buckets by one moves only ~1/num_buckets of the keys.
+    """
+    bucket, j = -1, 0
+    while j < num_buckets:
+        bucket = j
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        j = int((bucket + 1) * ((1 << 31) / ((key >> 33) + 1)))
+    return bucket
+
+def load_shard_counts(filepath=SHARD_STATE_FILE):
+    """Load {display name: shard count}. Returns {} if missing."""
+    if not os.path.exists(filepath):
+        return {}
+    try:
+        with open(filepath, 'r') as f:
+            return json.load(f)
+    except ValueError:
+        return {}
+
+def save_shard_count(display_name, shard_count, filepath=SHARD_STATE_FILE):
+    """Record the shard count display_name is created with."""
+    with state_file_lock(filepath):
+        counts = load_shard_counts(filepath)
+        if counts.get(display_name) == shard_count:
+            return
+        counts[display_name] = shard_count
+        tmp_path = f"{filepath}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(counts, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, filepath)
+
+def shard_feed(display_name, subreddits, max_size=MAX_FEED_SIZE, shard_counts=None):
+    """
+    Split a feed larger than max_size into shards named "<name>-1", "<name>-2", ...
+    Each subreddit is placed by hashing its name, so adding or removing one
+    only touches the shard it hashes to. The shard count the feed was last
+    created with (shard_counts, loaded from SHARD_STATE_FILE by default) is
+    kept and only raised when a shard would overflow; only a feed sharded for
+    the first time is sized from its length. Feeds that fit are returned unchanged.
+    """
+    if len(subreddits) <= max_size:
+        return {display_name: list(subreddits)}
+
+    if shard_counts is None:
+        shard_counts = load_shard_counts()
+    shard_count = shard_counts.get(display_name) or math.ceil(len(subreddits) / (max_size * SHARD_FILL))
+    while True:
+        shards = [[] for _ in range(shard_count)]
+        for sub in subreddits:
+            shards[jump_consistent_hash(stable_hash(sub), shard_count)].append(sub)
+        if all(len(shard) <= max_size for shard in shards):
+            break
+        shard_count += 1
+
+    return {f"{display_name}-{i + 1}": shard for i, shard in enumerate(shards)}
+
+def expand_sharded_feeds(feeds_data, max_size=MAX_FEED_SIZE):
+    """Return feeds_data with every oversized feed replaced by its shards."""
+    expanded = {}
+    shard_counts = load_shard_counts()
+    for display_name, subreddits in feeds_data.items():
+        expanded.update(shard_feed(display_name, subreddits, max_size, shard_counts))
+    return expanded
+
+def create_feed_shards(driver, username, shards, csrf_token):
+    """
+    Create the shards of one feed ({shard name: subreddit IDs}). Shards the
+    strategy stats allow Approach 1 for are created concurrently; the rest,
+    and any that failed, go through Approach 2 one by one.
+    Returns the names of shards that could not be created.
+    """
+    stats = load_strategy_stats()
+    bulk = {name: ids for name, ids in shards.items() if choose_create_strategy(stats, len(ids)) == 'bulk'}
+
+    print(f"\n{'='*60}")
+    print(f"📝 Creating {len(shards)} shards, {len(bulk)} in parallel: {', '.join(shards)}")
+    print(f"{'='*60}")
+
+    calls = [("CustomFeedCreate", {
+        "input": {
+            "displayName": name,
+            "descriptionMd": "",
+            "visibility": "PUBLIC",
+            "subredditIds": ids
+        }
+    }) for name, ids in bulk.items()]
+    results = dict(zip(bulk, graphql_batch(driver, calls, csrf_token))) if calls else {}
+
+    failed = []
+    for name, ids in shards.items():
+        if name in results:
+            failure = create_feed_failure(results[name])
+            if failure and created_despite_timeout(driver, name, results[name], shards[name]):
+                failure = None
+            record_strategy_outcome('bulk', len(ids), not failure, create_failure_type(results[name]) if failure else None)
+            if not failure:
+                print(f"✅ {name}: created with {len(ids)} subreddits")
+                continue
+            print(f"⚠️  {name}: {failure}")
+        else:
+            rate, attempts = bulk_success_rate(stats, len(ids))
+            print(f"⏭️  {name}: skipping Approach 1 - {rate:.0%} success over {attempts} attempts for feeds this size")
+
+        success = create_feed_empty_then_add(driver, username, name, ids, csrf_token)
+        record_strategy_outcome('incremental', len(ids), success, None if success else 'partial')
+        if not success:
+            failed.append(name)
+
+    return failed
+
+# ============================================================================
+# OFFLINE COMMANDS
+# ============================================================================
+
+SUBREDDIT_NAME_PATTERN = re.compile(r'^[A-Za-z0-9][A-Za-z0-9_]{1,20}$')
+
+def show_plan(feeds_data, ids_file):
+    """Print the feeds, shards, missing IDs and create strategy sync would use."""
+    subreddit_ids = load_subreddit_ids_from_file(ids_file)
+    stats = load_strategy_stats()
+    total_missing = set()
+
+    for display_name, subreddits in feeds_data.items():
+        missing = [sub for sub in subreddits if sub not in subreddit_ids]
+        total_missing.update(missing)
+        shards = {name: [sub for sub in subs if sub in subreddit_ids]
+                  for name, subs in shard_feed(display_name, subreddits).items()}
+
+        print(f"📝 {display_name}: {len(subreddits)} subreddits")
+        for name, subs in shards.items():
+            rate, attempts = bulk_success_rate(stats, len(subs))
+            strategy = "Approach 1 first" if attempts < STRATEGY_MIN_SAMPLES or rate >= STRATEGY_MIN_SUCCESS_RATE \
+                else "Approach 2 (Approach 1 re-probed occasionally)"
+            label = f"   ↳ {name}: {len(subs)} IDs" if len(shards) > 1 else f"   {len(subs)} IDs"
+            history = f"{rate:.0%} over {attempts} attempts" if attempts else "no attempts recorded"
+            print(f"{label}, {strategy} ({history})")
+        if missing:
+            print(f"   ⚠️  Missing IDs: {', '.join(missing)}")
+
+    print(f"\n📊 {len(feeds_data)} feeds, {len(expand_sharded_feeds(feeds_data))} after sharding, "
+          f"{len(total_missing)} IDs to resolve")
+
+def validate_feed_spec(feeds_data):
+    """Check the feed spec. Prints problems and returns the number of errors."""
+    errors = 0
+    slugs = {}
+    first_feed = {}
+
+    for display_name, subreddits in feeds_data.items():
+        if not isinstance(subreddits, list) or not subreddits:
+            print(f"❌ {display_name}: must be a non-empty list of subreddit names")
+            errors += 1
+            continue
+
+        slug = generate_feed_slug(display_name)
+        if slug in slugs:
+            print(f"❌ {display_name}: same URL slug '{slug}' as {slugs[slug]}")
+            errors += 1
+        slugs[slug] = display_name
+
+        seen = set()
+        for sub in subreddits:
+            if not isinstance(sub, str) or not SUBREDDIT_NAME_PATTERN.match(sub):
+                print(f"❌ {display_name}: invalid subreddit name {sub!r}")
+                errors += 1
+                continue
+            if sub.lower() in seen:
+                print(f"❌ {display_name}: {sub} listed twice")
+                errors += 1
+            seen.add(sub.lower())
+
+            other = first_feed.setdefault(sub.lower(), display_name)
+            if other != display_name:
+                print(f"ℹ️  {sub} is in both {other} and {display_name}")
+
+        if len(subreddits) > MAX_FEED_SIZE:
+            print(f"ℹ️  {display_name}: {len(subreddits)} subreddits, will be split into "
+                  f"{len(shard_feed(display_name, subreddits))} shards")
+
+    print(f"\n{'✅' if not errors else '❌'} {len(feeds_data)} feeds checked, {errors} error(s)")
+    return errors
+
+def show_strategy_stats(filepath):
+    """Print recorded create-strategy outcomes per size bucket."""
+    stats = load_strategy_stats(filepath)
+    if not stats:
+        print(f"No strategy stats recorded yet ({filepath})")
+        return
+
+    for strategy, buckets in sorted(stats.items()):
+        print(f"📦 {strategy}")
+        for bucket, outcome in sorted(buckets.items(), key=lambda item: int(item[0].lstrip('<=>'))):
+            attempts = outcome['success'] + outcome['failure']
+            errors = ', '.join(f"{kind}: {count}" for kind, count in sorted(outcome['errors'].items()))
+            print(f"   {bucket:>6} subreddits: {outcome['success']}/{attempts} succeeded"
+                  f"{f' ({errors})' if errors else ''}")
+
+def diff_cache(feeds_data, ids_file):
+    """Print subreddits missing from the ID cache, unused cache entries and shared IDs."""
+    subreddit_ids = load_subreddit_ids_from_file(ids_file)
+    needed = get_all_unique_subreddits(feeds_data)
+
+    missing = sorted(needed - set(subreddit_ids), key=str.lower)
+    unused = sorted(set(subreddit_ids) - needed, key=str.lower)
+    names_by_id = {}
+    for name, sid in subreddit_ids.items():
+        names_by_id.setdefault(sid, []).append(name)
+    shared = {sid: names for sid, names in names_by_id.items() if len(names) > 1}
+
+    print(f"➕ Missing from cache ({len(missing)}): {', '.join(missing) or '-'}")
+    print(f"➖ Cached but unused ({len(unused)}): {', '.join(unused) or '-'}")
+    print(f"⚠️  IDs shared by several names ({len(shared)}):")
+    for sid, names in sorted(shared.items()):
+        print(f"   {sid}: {', '.join(sorted(names))}")
+    return bool(missing or shared)
+
+# ============================================================================
+# DAEMON
+# ============================================================================
+
+class WarmSession:
+    """Browser, CSRF token, HTTP session and ID cache kept alive between daemon jobs."""
+
+    def __init__(self, username, profile_path, spec_path, ids_file):
+        self.username = username
+        self.profile_path = profile_path
+        self.spec_path = spec_path
+        self.ids_file = ids_file
+        self.subreddit_ids = load_subreddit_ids_from_file(ids_file)
+        self.dead = dead_subreddits()
+        self.driver = None
+        self.csrf_token = None
+        self.csrf_loaded = 0.0
+        self.http = None
+
+    def browser(self):
+        """Return (driver, csrf_token), restarting the browser or reloading the token only when needed."""
+        from selenium.common.exceptions import WebDriverException
+
+        if self.driver is not None:
+            try:
+                _ = self.driver.current_url
+            except WebDriverException:
+                print("⚠️  Browser went away, restarting it")
+                self.driver = None
+
+        if self.driver is None:
+            self.driver = initialize_driver(self.profile_path)
+            self.csrf_loaded = 0.0
+
+        if time.monotonic() - self.csrf_loaded > CSRF_MAX_AGE:
+            self.csrf_token = get_csrf_token(self.driver)
+            install_graphql_helper(self.driver)
+            self.csrf_loaded = time.monotonic()
+        return self.driver, self.csrf_token
+
+    def live(self, subreddits):
+        """subreddits without the ones validation found dead."""
+        return [sub for sub in subreddits if sub not in self.dead]
+
+    def resolve(self, names):
+        """
+        Return ({name: id}, [unresolved names]), looking up uncached names over
+        HTTP. Dead subreddits are skipped and appear in neither.
+        """
+        from reddit_api import create_session
+
+        if self.http is None:
+            self.http = create_session()
+
+        found, missing, new = {}, [], False
+        for name in names:
+            if name in self.dead:
+                print(f"  ⏭️  {name}: dead or private, skipped")
+                continue
+            sid = self.subreddit_ids.get(name)
+            if not sid:
+                sid = resolve_subreddit_id(self.http, name)
+                if sid:
+                    self.subreddit_ids[name] = sid
+                    new = True
+            if sid:
+                found[name] = sid
+            else:
+                missing.append(name)
+
+        if new:
+            save_subreddit_ids_to_file(self.subreddit_ids, self.ids_file)
+        return found, missing
+
+    def close(self):
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+            self.driver = None
+
+def run_daemon_job(warm, request):
+    """Run one daemon job ('sync-feed', 'add' or 'resolve') on the warm session and return its result."""
+    job = request.get('job')
+
+    if job == 'resolve':
+        found, missing = warm.resolve(request.get('names', []))
+        for name, sid in found.items():
+            print(f"  🔎 {name}: {sid}")
+        return {'ids': found, 'missing': missing}
+
+    if job == 'add':
+        # Sharded feeds only exist as <name>-N; which shard a subreddit belongs in is the spec's business
+        spec_size = len(load_feed_spec(warm.spec_path).get(request['feed'], []))
+        if spec_size > MAX_FEED_SIZE:
+            raise ValueError(f"{request['feed']} is sharded ({spec_size} subreddits) - add to the spec and run sync-feed")
+
+        names = [sub for sub in request.get('subreddits', []) if not sub.startswith('t5_')]
+        found, missing = warm.resolve(names)
+        ids = [sub for sub in request.get('subreddits', []) if sub.startswith('t5_')] + list(found.values())
+        ok = True
+        if ids:
+            driver, csrf_token = warm.browser()
+            ok = change_feed_members(driver, warm.username, generate_feed_slug(request['feed']), "CustomFeedAddSubreddits",
+                                     ids, csrf_token)
+        print(f"  {'✅' if ok else '❌'} Adding {len(ids)} subreddit(s) to {request['feed']}")
+        return {'ok': ok, 'added': len(ids) if ok else 0, 'missing': missing}
+
+    if job == 'sync-feed':
+        feeds_data = load_feed_spec(warm.spec_path)
+        display_name = request['feed']
+        if display_name not in feeds_data:
+            raise ValueError(f"unknown feed {display_name!r}")
+        subreddits = warm.live(feeds_data[display_name])
+        found, missing = warm.resolve(subreddits)
+
+        driver, csrf_token = warm.browser()
+        deleted = sum(delete_custom_feed(driver, warm.username, slug, csrf_token)
+                      for slug in feed_slugs_to_delete(display_name, subreddits, list_feed_slugs(driver)))
+        failed = create_feed(driver, warm.username, display_name, subreddits, found, csrf_token)
+        return {'deleted': deleted, 'failed': failed, 'missing': missing}
+
+    raise ValueError(f"unknown job {job!r}")
+
+def run_daemon(args):
+    """Start the browser once and serve jobs from the socket until stopped."""
+    from feed_daemon import JobServer
+
+    warm = WarmSession(args.username, args.firefox_profile, args.spec, args.ids_file)
+    try:
+        if not args.lazy:
+            warm.browser()
+        print(f"🔥 Warm session ready for u/{args.username}")
+        JobServer(args.socket, lambda request: run_daemon_job(warm, request)).serve_forever()
+    except KeyboardInterrupt:
+        print("\n⏹️  Daemon stopped")
+    finally:
+        warm.close()
+
+def submit_to_daemon(args):
+    """Send one job to a running daemon and print its progress."""
+    from feed_daemon import submit_job
+
+    needed = {'sync-feed': 1, 'add': 2, 'resolve': 1}.get(args.job, 0)
+    if len(args.args) < needed:
+        print(f"❌ {args.job} needs {needed} argument(s): sync-feed FEED | add FEED SUBREDDIT... | resolve NAME...")
+        sys.exit(2)
+
+    if args.job == 'sync-feed':
+        request = {'job': 'sync-feed', 'feed': " ".join(args.args)}
+    elif args.job == 'add':
+        request = {'job': 'add', 'feed': args.args[0], 'subreddits': args.args[1:]}
+    elif args.job == 'resolve':
+        request = {'job': 'resolve', 'names': args.args}
+    else:
+        request = {'job': args.job}
+
+    def show(event):
+        if event['event'] == 'queued' and event['position'] > 1:
+            print(f"⏳ Queued as job #{event['job']} ({event['position'] - 1} ahead)")
+        elif event['event'] == 'progress':
+            print(event['message'])
+        elif event['event'] == 'done':
+            took = f" in {event['seconds']:.1f}s" if 'seconds' in event else ""
+            print(f"✅ Done{took}: {json.dumps(event['result'])}")
+        elif event['event'] == 'error':
+            print(f"❌ {event['error']}")
+
+    final = submit_job(request, args.socket, show)
+    sys.exit(1 if final['event'] == 'error' else 0)
+
+# ============================================================================
+# WATCH MODE
+# ============================================================================
+
+def recreate_feed(warm, display_name, subreddits):
+    """
+    Delete and recreate one feed (and its shards). Returns [display_name] if a
+    shard failed or a subreddit ID could not be resolved, like the spec's keys.
+    """
+    subreddits = warm.live(subreddits)
+    found, missing = warm.resolve(subreddits)
+    driver, csrf_token = warm.browser()
+    for slug in feed_slugs_to_delete(display_name, subreddits, list_feed_slugs(driver)):
+        delete_custom_feed(driver, warm.username, slug, csrf_token)
+    failed = create_feed(driver, warm.username, display_name, subreddits, found, csrf_token)
+    return [display_name] if failed or missing else []
+
+def apply_spec_changes(warm, old_spec, new_spec):
+    """
+    Bring the live feeds from old_spec to new_spec with as few mutations as
+    possible: one add and one remove call per changed feed. Feeds that are or
+    become sharded, or whose remove call is refused, are recreated instead.
+    Returns the names of feeds that could not be fully updated, including
+    feeds with subreddits whose ID could not be resolved.
+    """
+    from feed_watch import diff_specs
+
+    added, removed, changed = diff_specs(old_spec, new_spec)
+    failed = []
+
+    for display_name in added:
+        print(f"➕ New feed {display_name}")
+        failed += recreate_feed(warm, display_name, new_spec[display_name])
+
+    for display_name in removed:
+        print(f"⚠️  {display_name} left the spec - not deleting it, remove it on Reddit if intended")
+
+    for display_name, (new_subs, gone_subs) in changed.items():
+        print(f"✏️  {display_name}: +{len(new_subs)} {' '.join(new_subs)} -{len(gone_subs)} {' '.join(gone_subs)}")
+        if max(len(old_spec[display_name]), len(new_spec[display_name])) > MAX_FEED_SIZE:
+            failed += recreate_feed(warm, display_name, new_spec[display_name])
+            continue
+
+        slug = generate_feed_slug(display_name)
+        ok = True
+        missing = []
+        if new_subs:
+            found, missing = warm.resolve(new_subs)
+            if missing:
+                print(f"  ❌ No ID for: {', '.join(missing)}")
+            if found:
+                driver, csrf_token = warm.browser()
+                ok = change_feed_members(driver, warm.username, slug, "CustomFeedAddSubreddits", list(found.values()),
+                                         csrf_token)
+        if ok and gone_subs:
+            found, unresolved = warm.resolve(gone_subs)
+            if unresolved:
+                # Still in the live feed, so the feed is retried like one with an unresolved addition
+                print(f"  ❌ No ID for: {', '.join(unresolved)}")
+                missing += unresolved
+            driver, csrf_token = warm.browser()
+            if found and not change_feed_members(driver, warm.username, slug, REMOVE_SUBREDDITS_OPERATION,
+                                                 list(found.values()), csrf_token):
+                print(f"  ↩️  Remove was refused, recreating {display_name}")
+                failed += recreate_feed(warm, display_name, new_spec[display_name])
+                continue
+        if ok and not missing:
+            print(f"  ✅ {display_name} updated")
+        else:
+            # Unresolved names count as a failure so the feed is retried after the next edit
+            failed.append(display_name)
+
+    return failed
+
+def watch_spec(args):
+    """Apply every saved edit of the spec file to the live feeds until interrupted."""
+    from feed_watch import SpecReader, create_watcher, wait_for_edit
+
+    reader = SpecReader(args.spec)
+    state_file = args.state_file or f"{args.spec}.applied.json"
+    current = reader.read()
+
+    # Edits made while nobody was watching are applied right away
+    if os.path.exists(state_file):
+        with open(state_file, 'r') as f:
+            applied = json.load(f)
+    else:
+        applied = current
+
+    def save_state(spec):
+        tmp_path = f"{state_file}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(spec, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, state_file)
+
+    warm = WarmSession(args.username, args.firefox_profile, args.spec, args.ids_file)
+    watcher = create_watcher(args.spec)
+    warm.browser()
+    print(f"👀 Watching {args.spec} ({type(watcher).__name__}), {len(current)} feeds")
+
+    try:
+        while True:
+            if current != applied:
+                started = time.monotonic()
+                failed = apply_spec_changes(warm, applied, current)
+                # Failed feeds keep their old membership so the next edit retries them
+                previous = applied
+                applied = {name: subs for name, subs in current.items() if name not in failed}
+                applied.update({name: previous[name] for name in failed if name in previous})
+                save_state(applied)
+                print(f"⚡ Applied in {time.monotonic() - started:.1f}s" + (f", failed: {', '.join(failed)}" if failed else ""))
+
+            wait_for_edit(watcher)
+            try:
+                current = reader.read()
+            except (OSError, ValueError) as e:
+                print(f"❌ Could not read {args.spec}: {e}")
+    except KeyboardInterrupt:
+        print("\n⏹️  Stopped watching")
+    finally:
+        watcher.close()
+        warm.close()
+
 # ============================================================================
 # MAIN EXECUTION
 # ============================================================================
 
-def main():
-    """Main execution function."""
+def create_parser():
+    """Create and return the argument parser."""
+    parser = argparse.ArgumentParser(description='Build and read Reddit custom feeds')
+    parser.add_argument('--cprofile',
+                        action='store_true',
+                        help='Run under cProfile and write .prof/.cprofile.txt reports')
+    parser.add_argument('--trace-memory',
+                        action='store_true',
+                        help='Run under tracemalloc and write a per-phase .memory.txt report')
+    subparsers = parser.add_subparsers(dest='command')
+
+    sync_parser = subparsers.add_parser('sync', help='Delete and recreate every custom feed (default)')
+    sync_parser.add_argument('--accounts',
+                             nargs='?',
+                             const=ACCOUNTS_FILE,
+                             metavar='FILE',
+                             help=f'Sync every account listed in FILE in parallel (default FILE: {ACCOUNTS_FILE})')
+    sync_parser.add_argument('--workers', type=int, help='Accounts synced at once (default: all)')
+    sync_parser.add_argument('--sequential',
+                             action='store_true',
+                             help='Scrape every missing ID in the browser before deleting and creating any feed')
+    sync_parser.add_argument('--skip-validate',
+                             action='store_true',
+                             help='Trust subreddit_ids.json without checking it against /api/info first')
+
+    validate_parser = subparsers.add_parser('validate', help='Check cached subreddit IDs and drop dead ones')
+    validate_parser.add_argument('--ids-file', default=SUBREDDIT_IDS_FILE)
+
+    plan_parser = subparsers.add_parser('plan', help='Show what sync would do, without a browser')
+    plan_parser.add_argument('--spec', help='Feed spec JSON (default: FEEDS_DATA)')
+    plan_parser.add_argument('--ids-file', default=SUBREDDIT_IDS_FILE)
+
+    spec_parser = subparsers.add_parser('validate-spec', help='Check the feed spec for mistakes (exit 1 on errors)')
+    spec_parser.add_argument('--spec', help='Feed spec JSON (default: FEEDS_DATA)')
+
+    subparsers.add_parser('list-presets', help='List network_debugger.py presets')
+
+    stats_parser = subparsers.add_parser('stats', help='Show recorded create-strategy outcomes')
+    stats_parser.add_argument('--stats-file', default=STRATEGY_STATS_FILE)
+
+    diff_parser = subparsers.add_parser('diff-cache', help='Compare the feed spec with subreddit_ids.json')
+    diff_parser.add_argument('--spec', help='Feed spec JSON (default: FEEDS_DATA)')
+    diff_parser.add_argument('--ids-file', default=SUBREDDIT_IDS_FILE)
+
+    read_parser = subparsers.add_parser('read', help='Fetch posts from every feed into one local stream')
+    read_parser.add_argument('--source',
+                             choices=['feed', 'subreddits'],
+                             default='feed',
+                             help='Read the custom feed listing, or its member subreddits directly (default: feed)')
+    read_parser.add_argument('--spec', help='Feed spec JSON (default: FEEDS_DATA)')
+    read_parser.add_argument('--feeds', nargs='+', help='Only read these feeds (display names)')
+    read_parser.add_argument('--sort', choices=['hot', 'new', 'top', 'rising'], default='new')
+    read_parser.add_argument('--pages', type=int, default=1, help='Listing pages per feed (default: 1)')
+    read_parser.add_argument('--rate', type=float, default=1.0, help='Requests per second across all feeds (default: 1)')
+    read_parser.add_argument('--json', action='store_true', help='Print one JSON object per post')
+    read_parser.add_argument('--no-cache', action='store_true', help='Fetch every page even if a recent run cached it')
+
+    ingest_parser = subparsers.add_parser('ingest', help='Add new posts from every feed to the local search index')
+    ingest_parser.add_argument('--spec', help='Feed spec JSON (default: FEEDS_DATA)')
+    ingest_parser.add_argument('--feeds', nargs='+', help='Only ingest these feeds (display names)')
+    ingest_parser.add_argument('--db', default='feed_index.db', help='Index database (default: feed_index.db)')
+    ingest_parser.add_argument('--pages', type=int, default=1, help='/new pages per subreddit on the first run (default: 1)')
+    ingest_parser.add_argument('--rate', type=float, default=1.0, help='Requests per second (default: 1)')
+
+    search_parser = subparsers.add_parser('search', help='Search indexed posts offline (FTS5 query syntax)')
+    search_parser.add_argument('query', nargs='+', help='Search terms, e.g. "rust async" or title:kafka')
+    search_parser.add_argument('--db', default='feed_index.db', help='Index database (default: feed_index.db)')
+    search_parser.add_argument('--feed', help='Only posts from this feed')
+    search_parser.add_argument('--subreddit', help='Only posts from this subreddit')
+    search_parser.add_argument('--sort', choices=['relevance', 'score', 'new'], default='relevance')
+    search_parser.add_argument('--limit', type=int, default=20)
+    search_parser.add_argument('--json', action='store_true', help='Print one JSON object per result')
+
+    daemon_parser = subparsers.add_parser('daemon', help='Keep a logged-in browser warm and run jobs sent with submit')
+    daemon_parser.add_argument('--socket', default=None, help='Unix socket path (default: ~/.cache/reddit-custom-feed/daemon.sock)')
+    daemon_parser.add_argument('--spec', help='Feed spec JSON, re-read for every job (default: FEEDS_DATA)')
+    daemon_parser.add_argument('--ids-file', default=SUBREDDIT_IDS_FILE)
+    daemon_parser.add_argument('--username', default=USERNAME)
+    daemon_parser.add_argument('--firefox-profile', default=PROFILE_PATH)
+    daemon_parser.add_argument('--lazy', action='store_true', help='Start the browser on the first job that needs it')
+
+    watch_parser = subparsers.add_parser('watch', help='Apply edits of a feed spec file to the live feeds as they are saved')
+    watch_parser.add_argument('spec', help='Feed spec: JSON like FEEDS_DATA, or .adoc with "== Feed" and "r/sub" lines')
+    watch_parser.add_argument('--state-file', help='Last applied spec (default: <spec>.applied.json)')
+    watch_parser.add_argument('--ids-file', default=SUBREDDIT_IDS_FILE)
+    watch_parser.add_argument('--username', default=USERNAME)
+    watch_parser.add_argument('--firefox-profile', default=PROFILE_PATH)
+
+    submit_parser = subparsers.add_parser('submit', help='Send a job to a running daemon')
+    submit_parser.add_argument('job', choices=['sync-feed', 'add', 'resolve', 'status', 'stop'])
+    submit_parser.add_argument('args',
+                               nargs='*',
+                               help='sync-feed FEED | add FEED SUBREDDIT_OR_ID... | resolve NAME...')
+    submit_parser.add_argument('--socket', default=None, help='Unix socket path (default: ~/.cache/reddit-custom-feed/daemon.sock)')
+
+    return parser
+
+def read_feeds(args):
+    """Stream posts from all feeds concurrently and print them."""
+    import asyncio
+    from feed_reader import CACHE_FILE, FeedReader, ListingCache, feed_listing_path, subreddits_listing_path
+
+    feeds = {name: subs for name, subs in load_feed_spec(args.spec).items() if not args.feeds or name in args.feeds}
+    if args.source == 'feed':
+        paths = {name: feed_listing_path(USERNAME, generate_feed_slug(name), args.sort) for name in feeds}
+    else:
+        paths = {name: subreddits_listing_path(subs, args.sort) for name, subs in feeds.items()}
+
+    async def run():
+        reader = FeedReader(rate=args.rate, pool_size=len(paths), cache=cache)
+        count = 0
+        async for feed_name, post in reader.stream(paths, args.pages):
+            count += 1
+            if args.json:
+                print(json.dumps({'feed': feed_name, **post}))
+            else:
+                print(f"[{feed_name}] r/{post.get('subreddit')} ⬆{post.get('score')} {post.get('title')}")
+                print(f"    {REDDIT_URL}{post.get('permalink', '')}")
+        return count
+
+    # Pages read within the last CACHE_TTL seconds, by this or an earlier run, are not fetched again
+    cache = ListingCache(path=None if args.no_cache else CACHE_FILE)
+    print(f"📖 Reading {len(paths)} feeds ({args.source}, {args.sort})...\n")
+    try:
+        count = asyncio.run(run())
+    finally:
+        cache.save()
+    print(f"\n📊 {count} posts")
+
+def search_feeds(args):
+    """Query the local feed index and print ranked results."""
+    import sqlite3
+    from feed_index import search_index
+
+    if not os.path.exists(args.db):
+        print(f"❌ {args.db} not found - run `whole.py ingest` first")
+        sys.exit(1)
+
+    started = time.perf_counter()
+    try:
+        results = search_index(" ".join(args.query), args.db, args.feed, args.subreddit, args.sort, args.limit)
+    except sqlite3.OperationalError as e:
+        print(f"❌ Bad query: {e}")
+        sys.exit(1)
+    elapsed = (time.perf_counter() - started) * 1000
+
+    for result in results:
+        if args.json:
+            print(json.dumps(result))
+            continue
+        print(f"[{result['feeds']}] r/{result['subreddit']} ⬆{result['score']} {result['title']}")
+        if result['snippet']:
+            print(f"    {result['snippet']}")
+        print(f"    {REDDIT_URL}{result['permalink'] or ''}")
+    if not args.json:
+        print(f"\n🔎 {len(results)} results in {elapsed:.1f}ms")
+
+def sync_feeds(username=USERNAME,
+               profile_path=PROFILE_PATH,
+               feeds_data=FEEDS_DATA,
+               ids_file=SUBREDDIT_IDS_FILE,
+               validate=True,
+               pipeline=True):
+    """
+    Collect IDs, then delete and recreate every feed in feeds_data. Returns a result summary.
+    With pipeline, feeds are recreated while missing IDs are still being resolved.
+    """
+    from run_profiler import mark_phase
+
+    # Step 0: Find dead and private subreddits so no mutation is spent on them
+    if validate:
+        import requests
+        try:
+            validate_subreddit_ids(ids_file)
+        except requests.RequestException as e:
+            print(f"⚠️  Could not validate IDs ({e}), continuing without validation\n")
+        mark_phase("validate")
+    feeds_data = without_dead_subreddits(feeds_data, dead_subreddits())
+
     # Initialize driver
-    driver = initialize_driver()
+    driver = initialize_driver(profile_path)
+    mark_phase("browser started")
 
     try:
+        if pipeline:
+            csrf_token = get_csrf_token(driver)
+            subreddit_ids = load_subreddit_ids_from_file(ids_file)
+            deleted, failed_feeds = sync_feeds_pipelined(driver, username, feeds_data, subreddit_ids, csrf_token)
+            save_subreddit_ids_to_file(subreddit_ids, ids_file)
+            mark_phase("pipeline")
+            print(f"\n🎉 All feeds processed! Visit {REDDIT_URL}/user/{username}/")
+            return {
+                'username': username,
+                'deleted': deleted,
+                'created': len(expand_sharded_feeds(feeds_data)) - len(failed_feeds),
+                'failed': failed_feeds,
+            }
+
         # Step 1: Ensure all subreddit IDs are collected
-        all_subreddits = get_all_unique_subreddits(FEEDS_DATA)
-        subreddit_ids = ensure_all_subreddit_ids(driver, all_subreddits, SUBREDDIT_IDS_FILE)
+        all_subreddits = get_all_unique_subreddits(feeds_data)
+        subreddit_ids = ensure_all_subreddit_ids(driver, all_subreddits, ids_file)
+        mark_phase("collect IDs")
 
         # Step 2: Get CSRF token
         csrf_token = get_csrf_token(driver)
 
         # Step 3: Delete existing feeds
-        delete_all_existing_feeds(driver, USERNAME, FEEDS_DATA, csrf_token)
+        deleted, _ = delete_all_existing_feeds(driver, username, feeds_data, csrf_token)
+        mark_phase("delete feeds")
 
         # Step 4: Create all new feeds
-        create_all_feeds(driver, USERNAME, FEEDS_DATA, subreddit_ids, csrf_token)
+        failed_feeds = create_all_feeds(driver, username, feeds_data, subreddit_ids, csrf_token)
+        mark_phase("create feeds")
 
-        print(f"\n🎉 All feeds processed! Visit https://www.reddit.com/user/{USERNAME}/")
+        print(f"\n🎉 All feeds processed! Visit {REDDIT_URL}/user/{username}/")
 
     finally:
         driver.quit()
 
+    return {
+        'username': username,
+        'deleted': deleted,
+        'created': len(expand_sharded_feeds(feeds_data)) - len(failed_feeds),
+        'failed': failed_feeds,
+    }
+
+def sync_account(account):
+    """
+    Sync one account in the current (worker) process, logging to sync-<username>.log.
+    Never raises, so one broken account does not take down the others.
+    """
+    username = account['username']
+    REQUEST_THROTTLE.min_interval = account.get('min_request_interval', 0.5)
+
+    with open(f"sync-{username}.log", 'w') as log, contextlib.redirect_stdout(log):
+        try:
+            feeds_data = load_feed_spec(account.get('feeds'))
+            return sync_feeds(username, account['profile'], feeds_data, account.get('ids_file', SUBREDDIT_IDS_FILE),
+                              not account.get('skip_validate', False), not account.get('sequential', False))
+        except Exception as e:
+            print(f"❌ Sync failed: {e}")
+            return {'username': username, 'error': str(e)}
+
+def sync_accounts(accounts, workers=None):
+    """Sync every account in its own process and browser, then print a combined summary."""
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    print(f"👥 Syncing {len(accounts)} accounts in parallel (logs: sync-<username>.log)...\n")
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers or len(accounts)) as pool:
+        futures = [pool.submit(sync_account, account) for account in accounts]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if result.get('error'):
+                print(f"  ❌ {result['username']}: {result['error'][:100]}")
+            elif result['failed']:
+                print(f"  ⚠️  {result['username']}: {result['created']} created, failed: {', '.join(result['failed'])}")
+            else:
+                print(f"  ✅ {result['username']}: {result['created']} feeds created")
+
+    ok = sum(1 for r in results if not r.get('error') and not r['failed'])
+    print(f"\n📊 {ok}/{len(accounts)} accounts fully synced")
+    return results
+
+def main():
+    """Main execution function."""
+    args = create_parser().parse_args()
+
+    if args.cprofile or args.trace_memory:
+        from run_profiler import RunProfiler, report_base
+        with RunProfiler(report_base(None, 'whole-run'), args.cprofile, args.trace_memory):
+            run_command(args)
+    else:
+        run_command(args)
+
+def run_command(args):
+    """Dispatch to the selected subcommand (sync by default)."""
+    if args.command == 'plan':
+        show_plan(load_feed_spec(args.spec), args.ids_file)
+    elif args.command == 'validate-spec':
+        sys.exit(1 if validate_feed_spec(load_feed_spec(args.spec)) else 0)
+    elif args.command == 'list-presets':
+        from network_debugger import list_presets
+        list_presets()
+    elif args.command == 'stats':
+        show_strategy_stats(args.stats_file)
+    elif args.command == 'diff-cache':
+        sys.exit(1 if diff_cache(load_feed_spec(args.spec), args.ids_file) else 0)
+    elif args.command == 'read':
+        read_feeds(args)
+    elif args.command == 'ingest':
+        from feed_index import ingest_feeds
+        feeds = load_feed_spec(args.spec)
+        ingest_feeds({name: subs for name, subs in feeds.items() if not args.feeds or name in args.feeds},
+                     args.db, args.pages, args.rate)
+    elif args.command == 'search':
+        search_feeds(args)
+    elif args.command == 'validate':
+        validate_subreddit_ids(args.ids_file)
+    elif args.command == 'watch':
+        watch_spec(args)
+    elif args.command in ('daemon', 'submit'):
+        from feed_daemon import SOCKET_PATH
+        args.socket = args.socket or SOCKET_PATH
+        if args.command == 'daemon':
+            run_daemon(args)
+        else:
+            submit_to_daemon(args)
+    elif getattr(args, 'accounts', None):
+        sync_accounts(load_accounts(args.accounts), args.workers)
+    else:
+        sync_feeds(validate=not getattr(args, 'skip_validate', False), pipeline=not getattr(args, 'sequential', False))
+
 if __name__ == "__main__":
     main()